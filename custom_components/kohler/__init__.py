@@ -13,39 +13,90 @@ engineering write-up.
 
 from __future__ import annotations
 
-import base64
-import binascii
-import json
+import asyncio
+import hashlib
 import logging
+import time
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from datetime import timedelta
+from functools import partial
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import (
+    ConfigEntryAuthFailed,
+    ConfigEntryNotReady,
+    HomeAssistantError,
+)
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_time_interval,
+)
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from kohler_anthem import KohlerAnthemClient, KohlerConfig
-from kohler_anthem.exceptions import AuthenticationError, KohlerAnthemError
-from kohler_anthem.models import Device, DeviceState, Outlet, Preset, PresetResponse
+from kohler_anthem.exceptions import (
+    ApiError,
+    AuthenticationError,
+    DeviceNotFoundError,
+    KohlerAnthemError,
+)
+from kohler_anthem.models import (
+    Customer,
+    Device,
+    DeviceState,
+    Outlet,
+    Preset,
+    PresetResponse,
+    ValveControlModel,
+)
 
 from .const import (
     CONF_API_RESOURCE,
     CONF_APIM_KEY,
     CONF_B2C_REFRESH_TOKEN,
     CONF_CLIENT_ID,
+    CONF_CONFIRM_TIMEOUT,
+    CONF_LIVE_UPDATE_DELAY,
+    CONF_MAX_CONCURRENT_REQUESTS,
     CONF_TEMPERATURE_UNIT,
     CONF_TENANT_ID,
+    CONFIRM_INITIAL_DELAY,
+    CONFIRM_MAX_DELAY,
     DEFAULT_API_RESOURCE,
     DEFAULT_CLIENT_ID,
+    DEFAULT_CONFIRM_TIMEOUT,
+    DEFAULT_LIVE_UPDATE_DELAY,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
     DOMAIN,
-    PRESET_REFRESH_CYCLES,
+    PRESET_REFRESH_INTERVAL,
+    PRESET_STEP_RETRIES,
+    PRESET_STEP_RETRY_DELAY,
     SCAN_INTERVAL,
+    SKU_GCS,
+    TOKEN_RETRY_DELAY,
     WARMUP_DISABLED,
 )
-from .helpers import build_preset_valve_control, preset_has_valve_data
+from .capture import PayloadCapture
+from .commands import KEY_RUNTIME, CommandOutcome, DeviceCommandQueue
+from .derived import EMPTY_PRESET_INDEX, PRIMARY_VALVE, DeviceView, PresetIndex
+from .helpers import (
+    build_off_control,
+    build_outlet_control,
+    build_preset_valve_control,
+    is_offline_error,
+    preset_has_valve_data,
+    to_celsius,
+)
+from .handoff import async_claim_handoff
+from .metrics import ApiMetrics, CallOutcome, LatencyHistogram
+from .prometheus import async_register_metrics_view
+from .scheduler import OfflineBreaker, PollSchedule
+from .store import KohlerStore
+from .tokens import TokenRefresher, decode_token_claims
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -58,20 +109,15 @@ PLATFORMS = [
     Platform.WATER_HEATER,
 ]
 
-# Kohler's backend returns this when the physical device is powered off or has
-# lost its network/cloud link. It is an expected, transient condition — not an
-# error in the integration — so we surface it gently rather than as a traceback.
-KOHLER_OFFLINE_STATUS = 900
 
-
-def is_offline_error(err: KohlerAnthemError) -> bool:
-    """True if an API error means the device is offline (vs a real failure)."""
-    raw = getattr(err, "raw_response", None)
-    if isinstance(raw, dict) and raw.get("statusCode") == KOHLER_OFFLINE_STATUS:
-        return True
-    # Fallback: some responses only carry the message text.
-    text = str(raw) if raw is not None else str(err)
-    return "product is offline" in text.lower()
+def is_transient_error(err: KohlerAnthemError) -> bool:
+    """True if a failed request is worth resending at once: a network error,
+    throttling or a gateway/server error (but not an offline device)."""
+    if not isinstance(err, ApiError) or isinstance(err, DeviceNotFoundError):
+        return False
+    status = err.status_code
+    transient = status is None or status == 429 or status >= 500
+    return transient and not is_offline_error(err)
 
 
 async def run_device_command(coro: "Any", action: str) -> None:
@@ -81,19 +127,24 @@ async def run_device_command(coro: "Any", action: str) -> None:
     instead of a traceback. Device-offline is logged at INFO (expected); other
     failures at ERROR.
     """
-    from homeassistant.exceptions import HomeAssistantError
-
     try:
         await coro
     except KohlerAnthemError as err:
-        if is_offline_error(err):
-            _LOGGER.info("Cannot %s: the shower is offline", action)
-            raise HomeAssistantError(
-                "The Kohler shower is offline. Check that it's powered on and "
-                "connected to Wi-Fi, then try again."
-            ) from err
-        _LOGGER.error("Failed to %s: %s", action, err)
-        raise HomeAssistantError(f"Kohler command failed: {err}") from err
+        raise device_command_error(err, action) from err
+
+
+def device_command_error(err: KohlerAnthemError, action: str) -> Exception:
+    """Log a failed command and return the HomeAssistantError to raise."""
+    from homeassistant.exceptions import HomeAssistantError
+
+    if is_offline_error(err):
+        _LOGGER.info("Cannot %s: the shower is offline", action)
+        return HomeAssistantError(
+            "The Kohler shower is offline. Check that it's powered on and "
+            "connected to Wi-Fi, then try again."
+        )
+    _LOGGER.error("Failed to %s: %s", action, err)
+    return HomeAssistantError(f"Kohler command failed: {err}")
 
 
 def decode_tenant_id(access_token: str | None) -> str | None:
@@ -103,27 +154,30 @@ def decode_tenant_id(access_token: str | None) -> str | None:
     which is carried as the ``oid`` (falling back to ``sub``) claim in the
     access token. Returns ``None`` if the token can't be decoded.
     """
-    if not access_token:
-        return None
-    try:
-        payload = access_token.split(".")[1]
-        payload += "=" * (-len(payload) % 4)
-        claims = json.loads(base64.urlsafe_b64decode(payload))
-    except (IndexError, ValueError, binascii.Error, json.JSONDecodeError) as err:
-        _LOGGER.warning("Could not decode access token for tenant id: %s", err)
+    claims = decode_token_claims(access_token)
+    if claims is None:
         return None
     return claims.get("oid") or claims.get("sub")
 
 
-def build_config(entry: ConfigEntry) -> KohlerConfig:
-    """Build a KohlerConfig from a config entry's stored data."""
+def gcs_devices(customer: Customer) -> list[Device]:
+    """The account's Anthem (GCS) devices, the only ones this integration drives."""
+    return [d for d in customer.get_all_devices() if d.sku == SKU_GCS]
+
+
+def build_config(entry: ConfigEntry, refresh_token: str | None = None) -> KohlerConfig:
+    """Build a KohlerConfig from a config entry's stored data.
+
+    ``refresh_token`` overrides the entry's seeded B2C token with a newer
+    rotated one.
+    """
     return KohlerConfig(
         username=entry.data[CONF_USERNAME],
         password=entry.data[CONF_PASSWORD],
         client_id=entry.data.get(CONF_CLIENT_ID, DEFAULT_CLIENT_ID),
         apim_subscription_key=entry.data[CONF_APIM_KEY],
         api_resource=entry.data.get(CONF_API_RESOURCE, DEFAULT_API_RESOURCE),
-        b2c_refresh_token=entry.data.get(CONF_B2C_REFRESH_TOKEN),
+        b2c_refresh_token=refresh_token or entry.data.get(CONF_B2C_REFRESH_TOKEN),
     )
 
 
@@ -131,46 +185,70 @@ def build_config(entry: ConfigEntry) -> KohlerConfig:
 class DeviceRuntime:
     """Per-device settings shared across entity platforms.
 
-    The Kohler API has no "set flow/outlet without running water" command, so
-    the number/select entities store the user's choice here and the
-    water_heater applies it when starting (or live-updates a running shower).
+    The Kohler API has no "set flow/outlet/temperature without running water"
+    command, so the number/select/water_heater entities store the user's
+    choice here and the water_heater applies it when starting (or
+    live-updates a running shower).
     """
 
     flow_percent: int = 100
     outlet: Outlet = Outlet.SHOWERHEAD
+    # Desired setpoint in the account's unit; None follows the device's own.
+    target_temperature: float | None = None
+    # (outlet, Celsius setpoint, flow %) of the last turn-on write the cloud
+    # accepted, to recognise a repeat of it as a no-op.
+    applied: tuple[Outlet, float, int] | None = None
 
 
-class KohlerKonnectCoordinator(DataUpdateCoordinator[dict[str, DeviceState]]):
-    """Polls device state for every Anthem device on the account."""
+class KohlerKonnectCoordinator:
+    """Account-level hub shared by every entity platform.
+
+    Holds the API client, account settings, presets and per-device runtime
+    settings, and owns one :class:`KohlerDeviceCoordinator` per device. Each
+    device polls on its own schedule, so a slow or offline shower never holds
+    up the others.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
         entry: ConfigEntry,
         client: KohlerAnthemClient,
+        store: KohlerStore,
         tenant_id: str,
         devices: list[Device],
         temperature_unit: str = "Fahrenheit",
         water_units: str = "Standard",
     ) -> None:
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(seconds=SCAN_INTERVAL),
-        )
-        self._entry = entry
+        self.hass = hass
+        self.entry = entry
         self.client = client
+        self.store = store
+        # Times every API call the integration makes, per endpoint and device.
+        self.metrics = ApiMetrics()
+        self.metrics.instrument(client)
+        # Each device's recent calls, for the diagnostics download.
+        self.capture = PayloadCapture()
+        self.metrics.observers.append(self.capture.observe)
+        self.tokens = TokenRefresher(
+            hass, entry, client, self.metrics, self.persist_rotated_token
+        )
         self.tenant_id = tenant_id
         self.devices = devices
-        # Snapshot of the reload-relevant config: everything EXCEPT the rotating
-        # B2C refresh token. The update listener diffs against this so that a
-        # bare token rotation (persisted on every poll after a write) does NOT
-        # reload the entry — reloading flaps every entity to `unavailable` for
-        # the reload window.
+        # Snapshot of the reload-relevant config: everything EXCEPT the seeded
+        # B2C refresh token, which only changes on reauth (and the reauth flow
+        # reloads the entry itself). The update listener diffs against this.
         self.loaded_config = {
             k: v for k, v in entry.data.items() if k != CONF_B2C_REFRESH_TOKEN
         }
+        self.loaded_options = dict(entry.options)
+        # Caps how many device-state requests are in flight at once across
+        # all of the account's device coordinators.
+        self._request_slots = asyncio.Semaphore(
+            entry.options.get(
+                CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+            )
+        )
         # The account's water volume unit ("Gallons"/"Liters"/"Standard").
         self.water_units = water_units
         # The Kohler account's temperature unit ("Celsius"/"Fahrenheit"). The
@@ -179,22 +257,79 @@ class KohlerKonnectCoordinator(DataUpdateCoordinator[dict[str, DeviceState]]):
         # library's write boundary.
         self.temperature_unit = temperature_unit
         # Presets/experiences per device. They change rarely (only when the
-        # user edits them in the Kohler app), so they're refreshed every
-        # PRESET_REFRESH_CYCLES state polls instead of every poll.
+        # user edits them in the Kohler app), so they're refreshed for the
+        # whole account every PRESET_REFRESH_INTERVAL seconds, separately from
+        # state polling.
         self.presets: dict[str, PresetResponse] = {}
-        self._preset_poll_countdown = 0
+        # Content hash of each device's cached presets, to spot unchanged ones.
+        self.preset_hashes: dict[str, str] = {}
+        self._preset_refresh_running = False
+        # Label/id lookups over each device's presets, rebuilt with them.
+        self.preset_indexes: dict[str, PresetIndex] = {}
+        # Each device's last OFF payload with the (valve topology, setpoint)
+        # it was built for; rebuilt only when either changes.
+        self._off_controls: dict[str, tuple[Any, ValveControlModel]] = {}
         self.runtime: dict[str, DeviceRuntime] = {
             device.device_id: DeviceRuntime() for device in devices
         }
+        # Every write to a device goes through its queue, in order.
+        self.command_queues: dict[str, DeviceCommandQueue] = {
+            device.device_id: DeviceCommandQueue(hass, entry, device.device_id)
+            for device in devices
+        }
+        # Live runtime changes to a running shower settle for this window
+        # (seconds); only the latest value is sent.
+        self._live_update_delay: float = entry.options.get(
+            CONF_LIVE_UPDATE_DELAY, DEFAULT_LIVE_UPDATE_DELAY
+        )
+        # Each change restarts its device's timer, so the write goes out once
+        # the changes stop for the whole window (a trailing debounce).
+        self._live_timers: dict[str, CALLBACK_TYPE] = {}
+        self._live_sends: dict[str, asyncio.Task[None]] = {}
+        self._live_actions: dict[str, str] = {}
+        self._confirm_timeout: float = entry.options.get(
+            CONF_CONFIRM_TIMEOUT, DEFAULT_CONFIRM_TIMEOUT
+        )
+        # Device i of n starts i/n of the way through its interval, spreading
+        # the account's polls evenly instead of firing them together.
+        self.device_coordinators: dict[str, KohlerDeviceCoordinator] = {
+            device.device_id: KohlerDeviceCoordinator(
+                hass, self, device, phase=index / len(devices)
+            )
+            for index, device in enumerate(devices)
+        }
+        for device_id, state in store.states.items():
+            if device_id in self.device_coordinators:
+                self.device_coordinators[device_id].seed(state)
+        # Devices without a snapshot stay unavailable until first read.
+        for coordinator in self.device_coordinators.values():
+            if not coordinator.stale:
+                coordinator.last_update_success = False
+        # Set once the client has signed in; polls and commands wait for it
+        # (see async_connect).
+        self._signed_in = asyncio.Event()
+        # Start from the cached catalogs so preset entities have options
+        # before the first refresh answers.
+        for device_id, presets in store.presets.items():
+            if device_id in self.device_coordinators:
+                self._store_presets(device_id, presets, persist=False)
+
+    def device_state(self, device_id: str) -> DeviceState | None:
+        """The device's last-known state, or ``None`` before the first read."""
+        return self.device_coordinators[device_id].data
+
+    def device_view(self, device_id: str) -> DeviceView | None:
+        """The device's derived view, or ``None`` before the first read."""
+        return self.device_coordinators[device_id].view
+
+    def preset_index(self, device_id: str) -> PresetIndex:
+        """The device's preset lookups (empty until presets are fetched)."""
+        return self.preset_indexes.get(device_id, EMPTY_PRESET_INDEX)
 
     def device_is_running(self, device_id: str) -> bool:
         """True if any valve on the device is actively flowing water."""
-        state = (self.data or {}).get(device_id)
-        if state is None:
-            return False
-        return any(
-            valve.is_active or valve.at_flow for valve in state.state.valve_state
-        )
+        view = self.device_view(device_id)
+        return view is not None and view.running
 
     def is_warmup_enabled(self, device_id: str) -> bool | None:
         """Whether the warmup feature is enabled on the fixture itself.
@@ -208,7 +343,7 @@ class KohlerKonnectCoordinator(DataUpdateCoordinator[dict[str, DeviceState]]):
 
         Returns ``None`` when no state has been read yet (unknown).
         """
-        state = (self.data or {}).get(device_id)
+        state = self.device_state(device_id)
         if state is None:
             return None
         return state.state.warm_up_state.warm_up != WARMUP_DISABLED
@@ -220,36 +355,321 @@ class KohlerKonnectCoordinator(DataUpdateCoordinator[dict[str, DeviceState]]):
         passed straight to the library's Celsius write methods with no
         conversion.
         """
-        state = (self.data or {}).get(device_id)
-        if state is not None:
-            for valve in state.state.valve_state:
-                if valve.valve_index == "Valve1" and valve.temperature_setpoint:
-                    return valve.temperature_setpoint
+        view = self.device_view(device_id)
+        if view is not None and view.setpoint_celsius:
+            return view.setpoint_celsius
         return 38.0
 
-    async def async_apply_runtime(self, device_id: str, action: str) -> None:
-        """Re-send the running command with the current runtime flow/outlet.
+    async def async_connect(self, revalidate: bool) -> None:
+        """Sign in (the token exchange) in the background, then start.
 
-        Used by the flow number and outlet select entities so changes take
-        effect immediately while the shower is running. No-op when the water
-        is off (the setting is simply applied on the next start).
+        Used when setup ran from the cached customer record: platforms load
+        without waiting for the token exchange, and polls and commands wait
+        for it instead. A network failure is retried after TOKEN_RETRY_DELAY
+        seconds; an auth failure starts reauth.
+        """
+        while True:
+            try:
+                await self.client.connect()
+            except AuthenticationError as err:
+                _LOGGER.warning("Authentication failed connecting to Kohler: %s", err)
+                self.entry.async_start_reauth(self.hass)
+                return
+            except (KohlerAnthemError, TimeoutError) as err:
+                _LOGGER.warning(
+                    "Unable to connect to Kohler API, retrying in %ss: %s",
+                    TOKEN_RETRY_DELAY,
+                    err,
+                )
+                # connect() opened a session before signing in; start afresh.
+                await self.client.close()
+                await asyncio.sleep(TOKEN_RETRY_DELAY)
+                continue
+            break
+        self.async_start(revalidate)
+
+    @callback
+    def async_start(self, revalidate: bool) -> None:
+        """Start everything the signed-in client does in the background.
+
+        That is the first state reads, token renewals and presets (which then
+        keep refreshing on their own timer) and, when ``revalidate`` (setup
+        ran from the cache), the customer record.
+        """
+        self._signed_in.set()
+        self.async_start_first_refresh()
+        self.tokens.async_start()
+        self.entry.async_create_background_task(
+            self.hass, self.async_refresh_presets(), "kohler preset refresh"
+        )
+        if revalidate:
+            self.entry.async_create_background_task(
+                self.hass,
+                self.async_revalidate_customer(),
+                "kohler customer refresh",
+            )
+        self.entry.async_on_unload(
+            async_track_time_interval(
+                self.hass,
+                self.async_refresh_presets,
+                timedelta(seconds=PRESET_REFRESH_INTERVAL),
+            )
+        )
+
+    @callback
+    def async_start_first_refresh(self) -> None:
+        """Start every device's first read in the background.
+
+        Setup doesn't wait on the cloud: platforms load as soon as the device
+        list is known and each device's entities fill in when its first read
+        lands. Devices seeded from the on-disk snapshot show that state
+        meanwhile; the rest stay unavailable until read. A device that fails
+        here keeps retrying on its own schedule, and an auth failure starts
+        reauth.
+        """
+        for coordinator in self.device_coordinators.values():
+            self.entry.async_create_background_task(
+                self.hass,
+                coordinator.async_refresh(),
+                f"kohler first refresh {coordinator.device_id}",
+            )
+
+    async def async_shutdown(self) -> None:
+        """Stop every device coordinator's polling and token renewals."""
+        self.tokens.async_stop()
+        for cancel in self._live_timers.values():
+            cancel()
+        self._live_timers.clear()
+        for queue in self.command_queues.values():
+            queue.cancel_pending()
+        for coordinator in self.device_coordinators.values():
+            await coordinator.async_shutdown()
+
+    async def async_refresh_device(self, device_id: str) -> None:
+        """Re-read ``device_id`` straight away, and only that device.
+
+        Called after every command so the result shows up immediately; the
+        device's fresh state then picks its own polling rate from there.
+        """
+        await self.device_coordinators[device_id].async_refresh_now()
+
+    async def async_send(
+        self,
+        device_id: str,
+        action: str,
+        factory: Callable[[], Awaitable[Any]],
+        key: str | None = None,
+    ) -> CommandOutcome:
+        """Send a write through the device's command queue.
+
+        Waits for sign-in first (see :meth:`async_connect`).
+        ``factory`` builds the library call when the command's turn comes;
+        failures come back as the ``HomeAssistantError`` from
+        :func:`run_device_command`. Commands sharing a ``key`` coalesce while
+        queued (see :mod:`.commands`).
+
+        Any write may change what the valves run, so the last turn-on stops
+        counting as applied once another command goes out; a turn-on records
+        it again when it is accepted (see :meth:`async_turn_on_outlet`).
+        """
+        await self._signed_in.wait()
+        runtime = self.runtime[device_id]
+
+        def _run() -> Awaitable[Any]:
+            runtime.applied = None
+            return run_device_command(factory(), action)
+
+        return await self.command_queues[device_id].async_submit(action, _run, key)
+
+    async def async_confirm(
+        self, device_id: str, expected: Callable[[DeviceView], bool]
+    ) -> bool:
+        """Re-read one device until its view satisfies ``expected``.
+
+        Used after a command has been accepted: the device is polled with a
+        short, growing backoff until it reports the expected state or the
+        confirmation timeout passes. Returns whether it was confirmed.
+        """
+        coordinator = self.device_coordinators[device_id]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._confirm_timeout
+        delay = CONFIRM_INITIAL_DELAY
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, CONFIRM_MAX_DELAY)
+            await coordinator.async_refresh_now()
+            if coordinator.view is not None and expected(coordinator.view):
+                return True
+
+    def runtime_setpoint_celsius(self, device_id: str) -> float:
+        """The setpoint a live runtime write should carry, in Celsius."""
+        runtime = self.runtime[device_id]
+        if runtime.target_temperature is not None:
+            return to_celsius(runtime.target_temperature, self.temperature_unit)
+        return self.current_setpoint_celsius(device_id)
+
+    def turn_on_is_applied(self, device_id: str, temperature_celsius: float) -> bool:
+        """True if a turn-on write with these settings would change nothing.
+
+        That takes the same write having been accepted last, and the device
+        still running at the flow and setpoint it asked for. The outlet isn't
+        reported back, so it is only compared with the last write.
+        """
+        view = self.device_view(device_id)
+        runtime = self.runtime[device_id]
+        if view is None or not view.running:
+            return False
+        primary = view.valves.get(PRIMARY_VALVE)
+        if primary is None:
+            return False
+        return (
+            runtime.applied == self._runtime_intent(device_id, temperature_celsius)
+            and primary.flow_setpoint == runtime.flow_percent
+            and abs(primary.temperature_setpoint - temperature_celsius) < 0.15
+        )
+
+    def _runtime_intent(
+        self, device_id: str, temperature_celsius: float
+    ) -> tuple[Outlet, float, int]:
+        """What a turn-on write would send, as recorded in ``applied``."""
+        runtime = self.runtime[device_id]
+        return (runtime.outlet, round(temperature_celsius, 1), runtime.flow_percent)
+
+    async def async_turn_on_outlet(
+        self, device_id: str, temperature_celsius: float
+    ) -> None:
+        """Run water on the runtime outlet and flow at ``temperature_celsius``."""
+        runtime = self.runtime[device_id]
+        outlet, flow_percent = runtime.outlet, runtime.flow_percent
+        await self.client.control_valve(
+            self.tenant_id,
+            device_id,
+            build_outlet_control(outlet, temperature_celsius, flow_percent),
+        )
+        runtime.applied = (outlet, round(temperature_celsius, 1), flow_percent)
+
+    async def async_apply_runtime(
+        self, device_id: str, action: str, force: bool = False
+    ) -> None:
+        """Re-send the running command with the current runtime settings.
+
+        Used by the flow number, outlet select and water heater temperature
+        so changes take effect while the shower is running. No-op when the
+        water is off (the setting is simply applied on the next start), or
+        when the device already runs with these settings unless ``force``.
+
+        Entities update optimistically from the runtime settings; the write
+        itself waits out the live-update window so that a burst of changes
+        (a dragged slider) sends only the settled value.
         """
         if not self.device_is_running(device_id):
             return
-        runtime = self.runtime[device_id]
-        await run_device_command(
-            self.client.turn_on_outlet(
-                self.tenant_id,
-                device_id,
-                runtime.outlet,
-                temperature_celsius=self.current_setpoint_celsius(device_id),
-                flow_percent=runtime.flow_percent,
-            ),
+        if self._live_update_delay <= 0 or force:
+            await self._async_send_runtime(device_id, action, force)
+            return
+        self._async_schedule_live_update(device_id, action)
+
+    @callback
+    def _async_schedule_live_update(self, device_id: str, action: str) -> None:
+        """(Re)start the device's settle timer for a live runtime change."""
+        self._live_actions[device_id] = action
+        if (cancel := self._live_timers.pop(device_id, None)) is not None:
+            cancel()
+
+        @callback
+        def _fire(_now: object) -> None:
+            self._live_timers.pop(device_id, None)
+            send = self._live_sends.get(device_id)
+            if send is not None and not send.done():
+                # The send in flight re-checks the runtime when it finishes.
+                return
+            self._live_sends[device_id] = self.entry.async_create_background_task(
+                self.hass,
+                self._async_send_settled_runtime(device_id),
+                f"kohler live update {device_id}",
+            )
+
+        self._live_timers[device_id] = async_call_later(
+            self.hass, self._live_update_delay, _fire
+        )
+
+    async def _async_send_settled_runtime(self, device_id: str) -> None:
+        """Send the runtime settings once a burst of live changes settles.
+
+        Changes made while the write was queued or in flight are sent after
+        it, unless a newer settle timer is already running for them.
+        """
+        while True:
+            action = self._live_actions.pop(device_id, "update the running shower")
+            if not self.device_is_running(device_id):
+                return
+            try:
+                await self._async_send_runtime(device_id, action)
+            except HomeAssistantError:
+                # No caller is waiting any more; run_device_command has logged
+                # it, and the refresh puts entities back in line with the device.
+                await self.async_refresh_device(device_id)
+                return
+            if device_id in self._live_timers:
+                return
+            if self.runtime[device_id].applied == self._runtime_intent(
+                device_id, self.runtime_setpoint_celsius(device_id)
+            ):
+                return
+
+    async def _async_send_runtime(
+        self, device_id: str, action: str, force: bool = False
+    ) -> None:
+        if not force and self.turn_on_is_applied(
+            device_id, self.runtime_setpoint_celsius(device_id)
+        ):
+            _LOGGER.debug("Skipping %s on %s: already applied", action, device_id)
+            return
+        outcome = await self.async_send(
+            device_id,
             action,
+            lambda: self.async_turn_on_outlet(
+                device_id, self.runtime_setpoint_celsius(device_id)
+            ),
+            key=KEY_RUNTIME,
         )
-        await self.async_request_refresh()
+        if outcome is CommandOutcome.SENT:
+            await self.async_refresh_device(device_id)
+
+    def off_control(
+        self, device_id: str, temperature_celsius: float
+    ) -> ValveControlModel:
+        """The payload that closes the device's valves (see ``build_off_control``)."""
+        view = self.device_view(device_id)
+        key = (view.valve_topology if view is not None else (), temperature_celsius)
+        cached = self._off_controls.get(device_id)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        control = build_off_control(*key)
+        self._off_controls[device_id] = (key, control)
+        return control
+
+    def preset_control(
+        self, device_id: str, preset: Preset
+    ) -> ValveControlModel | None:
+        """The payload that opens ``preset``'s valves; None for experiences.
+
+        Normally prebuilt (and validated) when the presets were refreshed.
+        """
+        index = self.preset_index(device_id)
+        if index.by_id.get(preset.id) is preset:
+            return index.start_controls.get(preset.id)
+        # A preset object from elsewhere (or a duplicate id): build it now.
+        if not preset_has_valve_data(preset):
+            return None
+        return build_preset_valve_control(preset)
 
-    async def async_start_preset(self, device_id: str, preset: Preset) -> None:
+    async def async_start_preset(
+        self, device_id: str, preset: Preset
+    ) -> CommandOutcome:
         """Start a preset: select it, then open its valves with mode 0x01.
 
         This replaces the library's ``client.start_preset``, which builds the
@@ -262,13 +682,19 @@ class KohlerKonnectCoordinator(DataUpdateCoordinator[dict[str, DeviceState]]):
         2. ``solowritesystem`` — opens the preset's valves at its stored
            temp/flow with mode ``0x01`` (SHOWER / on).
 
+        Step 1 is skipped when the device already reports the preset as
+        active, and a step that fails transiently is retried on its own.
+        Returns once the command is accepted, without re-reading the device:
+        callers confirm the result their own way.
+
         Raises ``HomeAssistantError`` for "experiences" (Wake Up, Shine, …),
         which carry no valve data and cannot be started through the device API;
         they must be started from the Kohler Konnect app.
         """
         from homeassistant.exceptions import HomeAssistantError
 
-        if not preset_has_valve_data(preset):
+        control = self.preset_control(device_id, preset)
+        if control is None:
             raise HomeAssistantError(
                 f"'{preset.title or preset.preset_id}' is a Kohler "
                 "\"experience\", which can't be started from Home Assistant — "
@@ -277,109 +703,320 @@ class KohlerKonnectCoordinator(DataUpdateCoordinator[dict[str, DeviceState]]):
                 "presets (e.g. Default shower) work from here."
             )
 
-        # Step 1: select the preset on the controller. Calling the library's
-        # start_preset with valve_details=None sends only the
-        # controlpresetorexperience POST (no valve write) — verified live that
-        # this selects the preset without opening any valve on its own.
-        await run_device_command(
-            self.client.start_preset(
-                self.tenant_id, device_id, preset.id, valve_details=None
-            ),
-            f"select preset {preset.title or preset.preset_id}",
-        )
-        # Step 2: open the valves with the corrected (mode 0x01) command.
-        await run_device_command(
-            self.client.control_valve(
-                self.tenant_id,
-                device_id,
-                build_preset_valve_control(preset),
-            ),
-            f"start preset {preset.title or preset.preset_id}",
-        )
-        await self.async_request_refresh()
+        name = preset.title or preset.preset_id
+
+        async def _start() -> None:
+            # Step 1: select the preset on the controller. Calling the
+            # library's start_preset with valve_details=None sends only the
+            # controlpresetorexperience POST (no valve write) — verified live
+            # that this selects the preset without opening any valve on its own.
+            # Read at the command's turn (an earlier command may have changed
+            # it), and trusted only from a live read, not the startup cache.
+            coordinator = self.device_coordinators[device_id]
+            view = coordinator.view
+            if coordinator.stale or view is None or view.active_preset_id != preset.id:
+                await self._async_preset_step(
+                    partial(
+                        self.client.start_preset,
+                        self.tenant_id,
+                        device_id,
+                        preset.id,
+                        valve_details=None,
+                    ),
+                    f"select preset {name}",
+                )
+            # Step 2: open the valves with the corrected (mode 0x01) command.
+            await self._async_preset_step(
+                partial(self.client.control_valve, self.tenant_id, device_id, control),
+                f"start preset {name}",
+            )
 
-    async def _async_refresh_presets(self) -> None:
-        """Fetch presets for every device; failures keep the previous cache."""
-        for device in self.devices:
+        # Both steps go through the queue as one command, so nothing else
+        # lands between them.
+        return await self.async_send(device_id, f"start preset {name}", _start)
+
+    async def _async_preset_step(
+        self, factory: Callable[[], Awaitable[Any]], action: str
+    ) -> None:
+        """Run one step of a preset start, retrying just it if it fails
+        transiently (both steps are idempotent, so a resend is safe)."""
+        for retries_left in range(PRESET_STEP_RETRIES, -1, -1):
             try:
-                self.presets[device.device_id] = await self.client.get_presets(
-                    device.device_id
-                )
-            except AuthenticationError:
-                raise
+                await factory()
+                return
             except KohlerAnthemError as err:
-                _LOGGER.debug(
-                    "Could not refresh presets for %s: %s", device.device_id, err
+                if not (retries_left and is_transient_error(err)):
+                    raise device_command_error(err, action) from err
+                _LOGGER.debug("Retrying %s after: %s", action, err)
+                await asyncio.sleep(PRESET_STEP_RETRY_DELAY)
+
+    async def async_refresh_presets(self, *_: Any) -> None:
+        """Refresh every device's presets concurrently, off the poll path.
+
+        Runs as its own background job (at setup and then every
+        PRESET_REFRESH_INTERVAL seconds), so a slow presets call never delays
+        a state update. Devices whose breaker is open are skipped. A payload
+        whose content hash matches the cached one is dropped before the index
+        rebuild and entity notifications. Failures keep the previous cache; an
+        auth failure starts reauth.
+        """
+        if self._preset_refresh_running:
+            return
+        self._preset_refresh_running = True
+        try:
+            device_ids = [
+                device_id
+                for device_id, coordinator in self.device_coordinators.items()
+                if not coordinator.breaker.is_open
+            ]
+            results = await asyncio.gather(
+                *(self._async_fetch_presets(device_id) for device_id in device_ids),
+                return_exceptions=True,
+            )
+        finally:
+            self._preset_refresh_running = False
+
+        for device_id, result in zip(device_ids, results):
+            if isinstance(result, AuthenticationError):
+                _LOGGER.warning("Authentication failed refreshing presets: %s", result)
+                self.entry.async_start_reauth(self.hass)
+                return
+            if isinstance(result, KohlerAnthemError):
+                _LOGGER.debug("Could not refresh presets for %s: %s", device_id, result)
+            elif isinstance(result, BaseException):
+                _LOGGER.exception(
+                    "Unexpected error refreshing presets for %s",
+                    device_id,
+                    exc_info=result,
                 )
+            elif self._store_presets(device_id, result):
+                # Preset names feed the select and active-preset sensor even
+                # when the device state itself is unchanged.
+                self.device_coordinators[device_id].async_update_listeners()
+
+    async def _async_fetch_presets(self, device_id: str) -> PresetResponse:
+        """Fetch one device's presets, holding a request slot while in flight."""
+        async with self._request_slots:
+            return await self.client.get_presets(device_id)
+
+    def _store_presets(
+        self, device_id: str, presets: PresetResponse, persist: bool = True
+    ) -> bool:
+        """Cache a device's presets if their content changed; True if it did.
+
+        The library parses the response before handing it over and exposes no
+        ETag, so the hash can't save the parse itself, only everything after it.
+        Changed catalogs are also written to the on-disk cache unless
+        ``persist`` is False (they were just loaded from it).
+        """
+        digest = hashlib.sha1(
+            presets.model_dump_json(by_alias=True).encode(), usedforsecurity=False
+        ).hexdigest()
+        if digest == self.preset_hashes.get(device_id):
+            return False
+        self.preset_hashes[device_id] = digest
+        self.presets[device_id] = presets
+        self.preset_indexes[device_id] = PresetIndex.from_response(presets)
+        if persist:
+            self.store.set_presets(device_id, presets)
+        return True
 
-    def _persist_rotated_token(self) -> None:
+    async def async_revalidate_customer(self) -> None:
+        """Refresh the cached customer record from the cloud.
+
+        Setup builds entities from the cached record when there is one; this
+        runs afterwards in the background. If the device list or account units
+        changed since the cache was written, the entry is reloaded so entities
+        match the account again.
+        """
+        try:
+            customer = await self.client.get_customer(self.tenant_id)
+        except AuthenticationError as err:
+            _LOGGER.warning("Authentication failed loading Kohler devices: %s", err)
+            self.entry.async_start_reauth(self.hass)
+            return
+        except KohlerAnthemError as err:
+            _LOGGER.debug("Could not revalidate cached Kohler devices: %s", err)
+            return
+
+        self.store.set_customer(customer)
+        devices = gcs_devices(customer)
+        # A unit captured at config time is pinned; otherwise setup took it
+        # from the (cached) customer record, so a live change matters too.
+        temperature_unit = self.entry.data.get(CONF_TEMPERATURE_UNIT) or getattr(
+            customer, "temperature_unit", "Fahrenheit"
+        )
+        if (
+            [d.model_dump() for d in devices] != [d.model_dump() for d in self.devices]
+            or getattr(customer, "water_units", "Standard") != self.water_units
+            or temperature_unit != self.temperature_unit
+        ):
+            _LOGGER.info("Kohler account devices or units changed; reloading")
+            self.hass.config_entries.async_schedule_reload(self.entry.entry_id)
+
+    async def async_fetch_state(self, device_id: str) -> DeviceState:
+        """Fetch one device's state, holding a request slot while in flight.
+
+        Times the whole poll, including any wait for a slot (but not for
+        sign-in, see :meth:`async_connect`).
+        """
+        await self._signed_in.wait()
+        coordinator = self.device_coordinators[device_id]
+        start = time.monotonic()
+        try:
+            async with self._request_slots:
+                state = await self.client.get_device_state(device_id)
+        except KohlerAnthemError as err:
+            outcome = (
+                CallOutcome.OFFLINE if is_offline_error(err) else CallOutcome.ERROR
+            )
+            coordinator.record_poll(time.monotonic() - start, outcome)
+            raise
+        coordinator.record_poll(time.monotonic() - start, CallOutcome.OK)
+        return state
+
+    def persist_rotated_token(self) -> None:
         """Persist the B2C refresh token if the library rotated it.
 
         B2C issues a new refresh token on every silent refresh; if we drop it
-        the user has to re-seed after the old one expires. Write it back to the
-        config entry whenever it changes.
+        the user has to re-seed after the old one expires. It goes to the
+        entry's store, whose debounced save bounds disk writes by time rather
+        than by request count, and never touches the config entry.
         """
         rotated = self.client.b2c_refresh_token
-        if rotated and rotated != self._entry.data.get(CONF_B2C_REFRESH_TOKEN):
-            self.hass.config_entries.async_update_entry(
-                self._entry,
-                data={**self._entry.data, CONF_B2C_REFRESH_TOKEN: rotated},
-            )
+        seed = self.entry.data[CONF_B2C_REFRESH_TOKEN]
+        if rotated and rotated != self.store.refresh_token(seed):
+            self.store.set_refresh_token(seed, rotated)
 
-    async def _async_update_data(self) -> dict[str, DeviceState]:
-        # Start from the last-known states so a single device's transient read
-        # failure (e.g. it's briefly offline) doesn't blank out every entity by
-        # failing the whole coordinator update.
-        states: dict[str, DeviceState] = dict(self.data or {})
-        any_success = False
-        errors: list[str] = []
 
-        if self._preset_poll_countdown <= 0:
-            try:
-                await self._async_refresh_presets()
-            except AuthenticationError as err:
-                raise ConfigEntryAuthFailed(
-                    f"Authentication failed during update: {err}"
-                ) from err
-            self._preset_poll_countdown = PRESET_REFRESH_CYCLES
-        self._preset_poll_countdown -= 1
+class KohlerDeviceCoordinator(DataUpdateCoordinator[DeviceState]):
+    """Polls one Anthem device on its own activity-driven schedule."""
 
-        for device in self.devices:
-            try:
-                states[device.device_id] = await self.client.get_device_state(
-                    device.device_id
-                )
-                any_success = True
-            except AuthenticationError as err:
-                # Auth problems are not per-device — bail to reauth immediately.
-                raise ConfigEntryAuthFailed(
-                    f"Authentication failed during update: {err}"
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        hub: KohlerKonnectCoordinator,
+        device: Device,
+        phase: float = 0.0,
+    ) -> None:
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{device.device_id}",
+            update_interval=timedelta(seconds=SCAN_INTERVAL),
+            # Most polls return an identical DeviceState (an idle shower
+            # reports the same thing for hours). Only notify entities when
+            # the state actually changed.
+            always_update=False,
+        )
+        self.hub = hub
+        self.device_id = device.device_id
+        self.schedule = PollSchedule(phase)
+        self.breaker = OfflineBreaker()
+        # Derived fields entities read, rebuilt only when the state changes.
+        self.view: DeviceView | None = None
+        # True while ``data`` is the snapshot restored at startup rather than
+        # a live read.
+        self.stale = False
+        self._refresh_now: asyncio.Task[None] | None = None
+        # How long each poll took, and when (monotonic) one last succeeded.
+        self.poll_durations = LatencyHistogram()
+        self.last_success_at: float | None = None
+
+    def record_poll(self, seconds: float, outcome: CallOutcome) -> None:
+        now = time.monotonic()
+        self.poll_durations.record(seconds, outcome, now)
+        if outcome is CallOutcome.OK:
+            self.last_success_at = now
+
+    async def async_refresh_now(self) -> None:
+        """Re-read this device now, skipping the request-refresh debouncer.
+
+        ``async_request_refresh`` holds a second request back for its
+        cooldown, which delays showing the result of back-to-back commands.
+        Callers arriving while a read is already in flight share it instead
+        of starting another.
+        """
+        if self._refresh_now is None or self._refresh_now.done():
+            self._refresh_now = self.hub.entry.async_create_background_task(
+                self.hass, self.async_refresh(), f"kohler refresh {self.device_id}"
+            )
+        await asyncio.shield(self._refresh_now)
+
+    def seed(self, state: DeviceState) -> None:
+        """Start from a state restored from disk, flagged stale until read."""
+        self.data = state
+        self.view = DeviceView.from_state(state, self.hub.temperature_unit)
+        self.stale = True
+
+    async def _async_update_data(self) -> DeviceState:
+        try:
+            state = await self.hub.async_fetch_state(self.device_id)
+        except AuthenticationError as err:
+            raise ConfigEntryAuthFailed(
+                f"Authentication failed during update: {err}"
+            ) from err
+        except KohlerAnthemError as err:
+            if is_offline_error(err):
+                self._handle_offline()
+            else:
+                self._schedule_next(self.data)
+            # Keep the previous state so a transient failure (e.g. the shower
+            # is briefly offline) doesn't blank out this device's entities.
+            if self.data is None:
+                raise UpdateFailed(
+                    f"Error communicating with Kohler API: {err}"
                 ) from err
-            except KohlerAnthemError as err:
-                # Keep this device's previous state; log offline gently.
-                if is_offline_error(err):
-                    _LOGGER.debug(
-                        "Device %s is offline; keeping last-known state",
-                        device.device_id,
-                    )
-                else:
-                    errors.append(f"{device.device_id}: {err}")
-
-        # Only fail the whole update if we have no states at all AND nothing
-        # succeeded — otherwise entities stay available with last-known data.
-        if not states and not any_success:
-            raise UpdateFailed(
-                "Error communicating with Kohler API: " + "; ".join(errors)
-                if errors
-                else "No device state available"
+            if not is_offline_error(err):
+                _LOGGER.warning(
+                    "Kohler update for %s failed: %s", self.device_id, err
+                )
+            return self.data
+
+        if self.breaker.record_success():
+            _LOGGER.info("Device %s is back online; resuming polling", self.device_id)
+            # The breaker isn't part of the DeviceState, so an unchanged state
+            # wouldn't otherwise refresh the breaker diagnostics.
+            self.async_update_listeners()
+        if self.stale:
+            self.stale = False
+            if state == self.data:
+                # An unchanged state won't notify entities on its own, but the
+                # stale flag they report just cleared.
+                self.async_update_listeners()
+        if self.view is None or state != self.data:
+            self.view = DeviceView.from_state(state, self.hub.temperature_unit)
+            self.hub.store.set_state(self.device_id, state)
+        self._schedule_next(state)
+        # A successful read may have rotated the B2C refresh token.
+        self.hub.persist_rotated_token()
+        return state
+
+    def _handle_offline(self) -> None:
+        """Count an offline response and either back off or keep polling."""
+        was_open = self.breaker.is_open
+        probe_delay = self.breaker.record_offline()
+        if probe_delay is None:
+            _LOGGER.debug(
+                "Device %s is offline; keeping last-known state", self.device_id
+            )
+            self._schedule_next(self.data, offline=True)
+            return
+        if not was_open:
+            _LOGGER.info(
+                "Device %s has been offline for %d polls; pausing polling and "
+                "probing with backoff until it returns",
+                self.device_id,
+                self.breaker.offline_count,
             )
-        if errors:
-            _LOGGER.warning("Kohler update had errors: %s", "; ".join(errors))
+        self.update_interval = timedelta(seconds=probe_delay)
+        self.async_update_listeners()
 
-        # A successful read may have rotated the B2C refresh token.
-        if any_success:
-            self._persist_rotated_token()
-        return states
+    def _schedule_next(self, state: DeviceState | None, offline: bool = False) -> None:
+        """Set when this device polls next, from what it was just doing."""
+        self.update_interval = timedelta(
+            seconds=self.schedule.next_interval(state, offline)
+        )
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -393,40 +1030,74 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             "integration's reauth prompt to sign in."
         )
 
-    config = build_config(entry)
-    client = KohlerAnthemClient(config)
-
+    store = KohlerStore(hass, entry.entry_id)
+    # Right after the config flow (new entry or reauth), reuse its signed-in
+    # client and customer record rather than repeating both round trips.
+    handoff = async_claim_handoff(
+        hass, entry.unique_id, entry.data[CONF_B2C_REFRESH_TOKEN]
+    )
+    # The store holds the newest rotated refresh token, so it's read before
+    # connecting.
     try:
-        await client.connect()
-    except AuthenticationError as err:
-        raise ConfigEntryAuthFailed(str(err)) from err
-    except KohlerAnthemError as err:
-        await client.close()
-        raise ConfigEntryNotReady(
-            f"Unable to connect to Kohler API: {err}"
-        ) from err
+        await store.async_load()
+    except HomeAssistantError as err:
+        # Only costs a slower start: everything is fetched from the cloud.
+        _LOGGER.warning("Could not read the Kohler cache: %s", err)
+
+    # The customer record (device list, units) rarely changes: start from the
+    # on-disk copy when there is one and revalidate it once entities exist.
+    if handoff is not None:
+        client = handoff.client
+        customer = handoff.customer
+        store.set_customer(customer)
+    else:
+        client = KohlerAnthemClient(
+            build_config(
+                entry, store.refresh_token(entry.data[CONF_B2C_REFRESH_TOKEN])
+            )
+        )
+        customer = store.customer
+    cached = handoff is None and customer is not None
+    tenant_id = entry.data.get(CONF_TENANT_ID)
+    # With the device list and tenant id known, cached entities don't need
+    # the client signed in: the token exchange then runs in the background.
+    connect_later = cached and bool(tenant_id)
+    if handoff is None and not connect_later:
+        try:
+            await client.connect()
+        except AuthenticationError as err:
+            await client.close()
+            raise ConfigEntryAuthFailed(str(err)) from err
+        except KohlerAnthemError as err:
+            await client.close()
+            raise ConfigEntryNotReady(
+                f"Unable to connect to Kohler API: {err}"
+            ) from err
 
     # tenant_id is needed for every customer/device call. Prefer the value
     # captured at config time; fall back to decoding it from the fresh token.
-    tenant_id = entry.data.get(CONF_TENANT_ID) or decode_tenant_id(
-        client._auth.token.access_token if client._auth.token else None
-    )
+    if not tenant_id:
+        tenant_id = decode_tenant_id(
+            client._auth.token.access_token if client._auth.token else None
+        )
     if not tenant_id:
         await client.close()
         raise ConfigEntryAuthFailed("Could not determine Kohler tenant id from token")
 
-    try:
-        customer = await client.get_customer(tenant_id)
-    except AuthenticationError as err:
-        await client.close()
-        raise ConfigEntryAuthFailed(str(err)) from err
-    except KohlerAnthemError as err:
-        await client.close()
-        raise ConfigEntryNotReady(
-            f"Unable to load Kohler devices: {err}"
-        ) from err
+    if customer is None:
+        try:
+            customer = await client.get_customer(tenant_id)
+        except AuthenticationError as err:
+            await client.close()
+            raise ConfigEntryAuthFailed(str(err)) from err
+        except KohlerAnthemError as err:
+            await client.close()
+            raise ConfigEntryNotReady(
+                f"Unable to load Kohler devices: {err}"
+            ) from err
+        store.set_customer(customer)
 
-    devices = [d for d in customer.get_all_devices() if d.sku == "GCS"]
+    devices = gcs_devices(customer)
     if not devices:
         _LOGGER.warning("No Anthem (GCS) devices found for this account")
 
@@ -439,11 +1110,31 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     water_units = getattr(customer, "water_units", "Standard")
 
     coordinator = KohlerKonnectCoordinator(
-        hass, entry, client, tenant_id, devices, temperature_unit, water_units
+        hass,
+        entry,
+        client,
+        store,
+        tenant_id,
+        devices,
+        temperature_unit,
+        water_units,
     )
-    await coordinator.async_config_entry_first_refresh()
-
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    async_register_metrics_view(hass)
+
+    # Registered before anything starts, so the timers and the client are
+    # released even if forwarding the platforms fails (unloading runs these
+    # after async_unload_entry, where repeating them is harmless).
+    entry.async_on_unload(coordinator.client.close)
+    entry.async_on_unload(coordinator.async_shutdown)
+
+    # Everything else the cloud has to say arrives in the background.
+    if connect_later:
+        entry.async_create_background_task(
+            hass, coordinator.async_connect(revalidate=True), "kohler connect"
+        )
+    else:
+        coordinator.async_start(revalidate=cached)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
@@ -453,13 +1144,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload the entry when its *reload-relevant* config changes.
 
-    The coordinator persists the B2C refresh token on every poll after a write
-    (B2C rotates it on each silent refresh). That persistence goes through
-    ``async_update_entry``, which fires this listener — but a bare token
-    rotation must NOT reload the entry: a reload tears down and rebuilds every
-    platform, flapping all entities to ``unavailable`` for the reload window.
-    So only reload when something *other* than the token changed (e.g. reauth
-    updated credentials / tenant id / temperature unit).
+    Rotated B2C refresh tokens go to the entry's store, not the entry, so they
+    never fire this listener. The entry's seeded token still changes on reauth,
+    but the reauth flow reloads the entry itself, so a bare token change must
+    NOT reload again: a reload tears down and rebuilds every platform, flapping
+    all entities to ``unavailable`` for the reload window. So only reload when
+    something *other* than the token changed (e.g. credentials / tenant id /
+    temperature unit, or the options).
     """
     coordinator: KohlerKonnectCoordinator | None = hass.data.get(DOMAIN, {}).get(
         entry.entry_id
@@ -468,8 +1159,11 @@ async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> Non
         new_config = {
             k: v for k, v in entry.data.items() if k != CONF_B2C_REFRESH_TOKEN
         }
-        if new_config == coordinator.loaded_config:
-            # Only the rotating refresh token changed — nothing to reload.
+        if (
+            new_config == coordinator.loaded_config
+            and dict(entry.options) == coordinator.loaded_options
+        ):
+            # Only the seeded refresh token changed — nothing to reload.
             return
     await hass.config_entries.async_reload(entry.entry_id)
 
@@ -479,5 +1173,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         coordinator: KohlerKonnectCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
+        await coordinator.store.async_flush()
         await coordinator.client.close()
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the entry's on-disk cache when the entry is removed."""
+    await KohlerStore(hass, entry.entry_id).async_remove()
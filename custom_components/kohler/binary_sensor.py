@@ -48,12 +48,13 @@ class KohlerRunningBinarySensor(KohlerEntity, BinarySensorEntity):
 
     @property
     def is_on(self) -> bool | None:
-        state = self._state
-        if state is None:
+        view = self._view
+        if view is None:
             return None
-        return any(
-            valve.is_active or valve.at_flow for valve in state.state.valve_state
-        )
+        return view.running
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        return (self.available, self.is_on)
 
 
 class KohlerValveProblemBinarySensor(KohlerEntity, BinarySensorEntity):
@@ -68,21 +69,21 @@ class KohlerValveProblemBinarySensor(KohlerEntity, BinarySensorEntity):
 
     @property
     def is_on(self) -> bool | None:
-        state = self._state
-        if state is None:
+        view = self._view
+        if view is None:
             return None
-        return any(valve.error_flag for valve in state.state.valve_state)
+        return bool(view.error_codes)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        state = self._state
-        if state is None:
+        view = self._view
+        if view is None:
             return {}
-        return {
-            f"{valve.valve_index}_error_code": valve.error_code
-            for valve in state.state.valve_state
-            if valve.error_flag
-        }
+        return view.error_codes
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        view = self._view
+        return (self.available, view and view.error_codes)
 
 
 class KohlerWarmupEnabledBinarySensor(KohlerEntity, BinarySensorEntity):
@@ -105,4 +106,7 @@ class KohlerWarmupEnabledBinarySensor(KohlerEntity, BinarySensorEntity):
     def is_on(self) -> bool | None:
         # None (unknown) until the first state read; keeps the entity from
         # reporting a definitive "off" before we've heard from the device.
-        return self.coordinator.is_warmup_enabled(self._device_id)
+        return self.hub.is_warmup_enabled(self._device_id)
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        return (self.available, self.is_on)
@@ -0,0 +1,137 @@
+"""Always-on capture of each device's recent API traffic, for diagnostics.
+
+When a shower misbehaved, the only evidence was ``_LOGGER.debug`` output,
+which nobody has enabled when it happens. Every client call now also lands in
+a small per-device ring buffer: the last few state reads, preset fetches and
+commands, with their timing and outcome. Each buffer has a fixed length, so
+memory stays bounded, and capturing only keeps references to the objects the
+library already parsed. Turning them into JSON (and redacting them) is left
+to the diagnostics download.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel
+
+from .const import DIAGNOSTICS_HISTORY, DIAGNOSTICS_PRESET_HISTORY
+from .metrics import ApiCall, CallOutcome
+
+# Endpoints whose result is the payload worth keeping; every other
+# instrumented call is a command, kept with what it sent.
+STATE_ENDPOINT = "get_device_state"
+PRESETS_ENDPOINT = "get_presets"
+
+
+@dataclass(frozen=True, slots=True)
+class CapturedCall:
+    """One call as captured; ``payload`` is rendered only on download."""
+
+    at: float  # Unix time the call finished
+    endpoint: str
+    outcome: CallOutcome
+    seconds: float
+    # The parsed response (reads) or the arguments sent (commands).
+    payload: Any
+    # See _error_dict: structured, so it can be redacted like the payloads.
+    error: dict[str, Any] | None
+
+
+@dataclass(slots=True)
+class DeviceCapture:
+    """Ring buffers of one device's recent calls, by kind."""
+
+    states: deque[CapturedCall] = field(
+        default_factory=lambda: deque(maxlen=DIAGNOSTICS_HISTORY)
+    )
+    presets: deque[CapturedCall] = field(
+        default_factory=lambda: deque(maxlen=DIAGNOSTICS_PRESET_HISTORY)
+    )
+    commands: deque[CapturedCall] = field(
+        default_factory=lambda: deque(maxlen=DIAGNOSTICS_HISTORY)
+    )
+
+    def as_dict(self) -> dict[str, list[dict[str, Any]]]:
+        return {
+            "states": [_call_dict(call) for call in self.states],
+            "presets": [_call_dict(call) for call in self.presets],
+            "commands": [_call_dict(call) for call in self.commands],
+        }
+
+
+class PayloadCapture:
+    """Per-device capture of recent API calls (an :class:`ApiMetrics` observer)."""
+
+    def __init__(self) -> None:
+        self.devices: dict[str, DeviceCapture] = {}
+
+    def observe(self, call: ApiCall) -> None:
+        if call.device_id is None:
+            return
+        if (device := self.devices.get(call.device_id)) is None:
+            device = self.devices[call.device_id] = DeviceCapture()
+        if call.endpoint == STATE_ENDPOINT:
+            buffer, payload = device.states, call.result
+        elif call.endpoint == PRESETS_ENDPOINT:
+            buffer, payload = device.presets, call.result
+        else:
+            # Commands take (tenant_id, device_id, ...): keep what follows,
+            # e.g. control_valve's ValveControlModel with its valve hex.
+            buffer = device.commands
+            payload = {"args": call.args[2:], **call.kwargs}
+        buffer.append(
+            CapturedCall(
+                at=time.time(),
+                endpoint=call.endpoint,
+                outcome=call.outcome,
+                seconds=call.seconds,
+                payload=payload,
+                error=None if call.error is None else _error_dict(call.error),
+            )
+        )
+
+
+def _error_dict(error: BaseException) -> dict[str, Any]:
+    """A failed call's error as fields diagnostics can redact.
+
+    The library's HTTP errors put the whole response body in their message,
+    where redaction can't reach it. So the message is only kept for errors
+    without a response, and a response body is kept as the dict it is.
+    """
+    raw = getattr(error, "raw_response", None)
+    return {
+        "type": type(error).__name__,
+        "status_code": getattr(error, "status_code", None),
+        "message": str(error) if raw is None else None,
+        "response": raw if isinstance(raw, dict) else None,
+    }
+
+
+def _call_dict(call: CapturedCall) -> dict[str, Any]:
+    return {
+        "at": datetime.fromtimestamp(call.at, tz=UTC).isoformat(),
+        "endpoint": call.endpoint,
+        "outcome": call.outcome.value,
+        "ms": round(call.seconds * 1000, 1),
+        "payload": _jsonable(call.payload),
+        "error": _jsonable(call.error),
+    }
+
+
+def _jsonable(value: Any) -> Any:
+    """Render a captured payload as JSON-safe data, in the API's field names."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [_jsonable(item) for item in value]
+    return value
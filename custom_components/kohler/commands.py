@@ -0,0 +1,118 @@
+"""Per-device command queue for Kohler Anthem writes.
+
+Every entity used to write to the device on its own, so writes raced: a flow
+change could land between the two halves of a turn-off, and an automation
+nudging the temperature fired one ``solowritesystem`` write per step. Each
+device now gets one queue. Commands run one at a time, in submission order.
+A command submitted with a ``key`` replaces a pending (not yet sent) command
+with the same key in place, so a burst of flow/temperature changes sends only
+the latest. Every caller learns what became of its command.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+# Live changes to a running shower's flow, temperature or outlet: only the
+# latest matters.
+KEY_RUNTIME = "runtime"
+
+
+class CommandOutcome(StrEnum):
+    """What became of a submitted command (failures raise instead)."""
+
+    SENT = "sent"
+    # Replaced by a later command with the same key before it was sent.
+    SUPERSEDED = "superseded"
+
+
+@dataclass(slots=True)
+class _Command:
+    action: str
+    # Builds the write when the command's turn comes, so it reads the latest
+    # runtime settings rather than those at submission time.
+    factory: Callable[[], Awaitable[Any]]
+    key: str | None
+    waiters: list[asyncio.Future[CommandOutcome]] = field(default_factory=list)
+
+
+class DeviceCommandQueue:
+    """Serializes and coalesces one device's writes."""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, device_id: str) -> None:
+        self._hass = hass
+        self._entry = entry
+        self._device_id = device_id
+        self._pending: deque[_Command] = deque()
+        self._worker: asyncio.Task[None] | None = None
+        self._sending = False
+
+    @property
+    def depth(self) -> int:
+        """Commands waiting to be sent, plus the one in flight."""
+        return len(self._pending) + self._sending
+
+    async def async_submit(
+        self,
+        action: str,
+        factory: Callable[[], Awaitable[Any]],
+        key: str | None = None,
+    ) -> CommandOutcome:
+        """Queue a command and wait for it to be sent, superseded or fail."""
+        waiter: asyncio.Future[CommandOutcome] = self._hass.loop.create_future()
+        command = None
+        if key is not None:
+            command = next((c for c in self._pending if c.key == key), None)
+        if command is not None:
+            # Last writer wins: keep the queue position, send the new write.
+            for superseded in command.waiters:
+                if not superseded.done():
+                    superseded.set_result(CommandOutcome.SUPERSEDED)
+            command.waiters.clear()
+            command.action = action
+            command.factory = factory
+        else:
+            command = _Command(action, factory, key)
+            self._pending.append(command)
+        command.waiters.append(waiter)
+
+        if self._worker is None or self._worker.done():
+            self._worker = self._entry.async_create_background_task(
+                self._hass, self._async_drain(), f"kohler commands {self._device_id}"
+            )
+        return await waiter
+
+    async def _async_drain(self) -> None:
+        while self._pending:
+            command = self._pending.popleft()
+            self._sending = True
+            try:
+                await command.factory()
+            except asyncio.CancelledError:
+                for waiter in command.waiters:
+                    waiter.cancel()
+                raise
+            except Exception as err:  # handed to the caller
+                for waiter in command.waiters:
+                    if not waiter.done():
+                        waiter.set_exception(err)
+            else:
+                for waiter in command.waiters:
+                    if not waiter.done():
+                        waiter.set_result(CommandOutcome.SENT)
+            finally:
+                self._sending = False
+
+    def cancel_pending(self) -> None:
+        """Drop unsent commands (the entry is unloading)."""
+        while self._pending:
+            for waiter in self._pending.popleft().waiters:
+                waiter.cancel()
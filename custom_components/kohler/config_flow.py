@@ -17,8 +17,14 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
 
 from kohler_anthem import KohlerAnthemClient, KohlerConfig
 from kohler_anthem.exceptions import AuthenticationError, KohlerAnthemError
@@ -29,13 +35,24 @@ from .const import (
     CONF_APIM_KEY,
     CONF_B2C_REFRESH_TOKEN,
     CONF_CLIENT_ID,
+    CONF_CONFIRM_TIMEOUT,
+    CONF_LIVE_UPDATE_DELAY,
+    CONF_MAX_CONCURRENT_REQUESTS,
     CONF_TEMPERATURE_UNIT,
     CONF_TENANT_ID,
     DEFAULT_API_RESOURCE,
     DEFAULT_APIM_KEY,
     DEFAULT_CLIENT_ID,
+    DEFAULT_CONFIRM_TIMEOUT,
+    DEFAULT_LIVE_UPDATE_DELAY,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
     DOMAIN,
+    MAX_CONCURRENT_REQUESTS_LIMIT,
+    MAX_CONFIRM_TIMEOUT,
+    MAX_LIVE_UPDATE_DELAY,
+    MIN_CONFIRM_TIMEOUT,
 )
+from .handoff import SetupHandoff, async_offer_handoff
 from .oauth import OAuthError, PendingSignIn, build_sign_in, exchange_code, parse_redirect
 
 _LOGGER = logging.getLogger(__name__)
@@ -62,6 +79,11 @@ class KohlerKonnectConfigFlow(ConfigFlow, domain=DOMAIN):
         self._pending: PendingSignIn | None = None
         self._reauth_entry: ConfigEntry | None = None
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        return KohlerKonnectOptionsFlow()
+
     # ------------------------------------------------------------------ #
     # Step 1: credentials
     # ------------------------------------------------------------------ #
@@ -139,6 +161,15 @@ class KohlerKonnectConfigFlow(ConfigFlow, domain=DOMAIN):
             b2c_refresh_token=refresh_token,
         )
 
+        # Settle which entry this is before any network work, so an abort
+        # never strands a connected client.
+        if self._reauth_entry is not None:
+            unique_id = self._reauth_entry.unique_id
+        else:
+            unique_id = self._creds[CONF_USERNAME].lower()
+            await self.async_set_unique_id(unique_id)
+            self._abort_if_unique_id_configured()
+
         client = KohlerAnthemClient(config)
         try:
             await client.connect()
@@ -146,6 +177,7 @@ class KohlerKonnectConfigFlow(ConfigFlow, domain=DOMAIN):
                 client._auth.token.access_token if client._auth.token else None
             )
             if not tenant_id:
+                await client.close()
                 errors["base"] = "cannot_connect"
                 return self._reshow_signin(errors)
 
@@ -155,15 +187,18 @@ class KohlerKonnectConfigFlow(ConfigFlow, domain=DOMAIN):
             # Capture the rotated refresh token (the connect above may rotate it).
             rotated = client.b2c_refresh_token or refresh_token
         except AuthenticationError as err:
+            await client.close()
             _LOGGER.error("Auth failed after sign-in: %s", err)
             errors["base"] = "invalid_auth"
             return self._reshow_signin(errors)
         except KohlerAnthemError as err:
+            await client.close()
             _LOGGER.error("Cannot connect after sign-in: %s", err)
             errors["base"] = "cannot_connect"
             return self._reshow_signin(errors)
-        finally:
+        except BaseException:
             await client.close()
+            raise
 
         data = {
             **self._creds,
@@ -172,6 +207,21 @@ class KohlerKonnectConfigFlow(ConfigFlow, domain=DOMAIN):
             CONF_TEMPERATURE_UNIT: temperature_unit,
         }
 
+        # The entry's setup follows right away; let it reuse this signed-in
+        # client and customer record instead of fetching them again.
+        if unique_id is not None:
+            async_offer_handoff(
+                self.hass,
+                unique_id,
+                SetupHandoff(
+                    client=client,
+                    refresh_token=rotated,
+                    customer=customer,
+                ),
+            )
+        else:
+            await client.close()
+
         # Reauth path: update the existing entry in place.
         if self._reauth_entry is not None:
             self.hass.config_entries.async_update_entry(
@@ -180,8 +230,6 @@ class KohlerKonnectConfigFlow(ConfigFlow, domain=DOMAIN):
             await self.hass.config_entries.async_reload(self._reauth_entry.entry_id)
             return self.async_abort(reason="reauth_successful")
 
-        await self.async_set_unique_id(self._creds[CONF_USERNAME].lower())
-        self._abort_if_unique_id_configured()
         return self.async_create_entry(
             title=f"Kohler Konnect ({self._creds[CONF_USERNAME]})",
             data=data,
@@ -198,6 +246,46 @@ class KohlerKonnectConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
 
+class KohlerKonnectOptionsFlow(OptionsFlow):
+    """Tune polling behaviour for an existing entry."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_MAX_CONCURRENT_REQUESTS,
+                    default=options.get(
+                        CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                    ),
+                ): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_CONCURRENT_REQUESTS_LIMIT)
+                ),
+                vol.Required(
+                    CONF_LIVE_UPDATE_DELAY,
+                    default=options.get(
+                        CONF_LIVE_UPDATE_DELAY, DEFAULT_LIVE_UPDATE_DELAY
+                    ),
+                ): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, max=MAX_LIVE_UPDATE_DELAY)
+                ),
+                vol.Required(
+                    CONF_CONFIRM_TIMEOUT,
+                    default=options.get(CONF_CONFIRM_TIMEOUT, DEFAULT_CONFIRM_TIMEOUT),
+                ): vol.All(
+                    vol.Coerce(int),
+                    vol.Range(min=MIN_CONFIRM_TIMEOUT, max=MAX_CONFIRM_TIMEOUT),
+                ),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema)
+
+
 def aiohttp_session(flow: ConfigFlow):
     """Return HA's shared aiohttp session (lazy import to keep module light)."""
     from homeassistant.helpers.aiohttp_client import async_get_clientsession
@@ -4,12 +4,87 @@ from __future__ import annotations
 
 DOMAIN = "kohler"
 
-# Polling interval for the DataUpdateCoordinator (seconds).
+# Polling intervals (seconds), picked per device from its last state:
+# water flowing or warming up polls fast, an open-but-paused session polls at
+# the normal rate, an idle shower slows right down, and one that just reported
+# offline is re-checked at a gentler pace until the breaker below trips.
+ACTIVE_SCAN_INTERVAL = 3
 SCAN_INTERVAL = 10
+IDLE_SCAN_INTERVAL = 60
+OFFLINE_SCAN_INTERVAL = 30
+
+# Offline circuit breaker: after this many consecutive offline responses a
+# device stops being polled and is only probed, with the gap between probes
+# doubling from the base up to the max (seconds). The first good read closes
+# the breaker and normal polling resumes.
+OFFLINE_BREAKER_THRESHOLD = 3
+BREAKER_BASE_BACKOFF = 60
+BREAKER_MAX_BACKOFF = 1800
+# Each device polls on its own schedule, offset from its siblings and jittered
+# by up to this fraction of the interval, so requests spread out over time.
+POLL_JITTER = 0.1
 
 # Presets/experiences change only when edited in the Kohler app, so refresh
-# them every N state polls (N * SCAN_INTERVAL seconds) rather than every poll.
-PRESET_REFRESH_CYCLES = 30
+# them every few minutes rather than on every state poll.
+PRESET_REFRESH_INTERVAL = 300
+# A step of a preset start (select, then open the valves) that fails with a
+# network or server error is resent on its own this many times, after
+# PRESET_STEP_RETRY_DELAY seconds.
+PRESET_STEP_RETRIES = 1
+PRESET_STEP_RETRY_DELAY = 1.0
+
+# How long (seconds) the config flow's signed-in client and customer record
+# wait for the new or reauthed entry's setup to claim them before being closed.
+HANDOFF_TTL = 60
+
+# Access tokens are renewed in the background this many seconds before their
+# JWT expiry (ahead of the library's own 5-minute lazy-refresh window), so
+# commands never wait on a token round trip. A renewal that fails for network
+# reasons is retried after TOKEN_RETRY_DELAY seconds.
+TOKEN_REFRESH_MARGIN = 600
+TOKEN_RETRY_DELAY = 60
+
+# API call metrics: latency histogram bucket bounds (seconds) and how many
+# minutes the rolling figures (percentiles, error rate, calls per hour) cover.
+# The per-device metric sensors recompute them every METRICS_SENSOR_INTERVAL
+# seconds, so they also age out while the device makes no calls.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0, 30.0)
+METRICS_WINDOW = 60
+METRICS_SENSOR_INTERVAL = 60
+
+# Diagnostics keep each device's last this many state reads and commands
+# (and fewer preset catalogs, which are large and rarely change).
+DIAGNOSTICS_HISTORY = 20
+DIAGNOSTICS_PRESET_HISTORY = 3
+
+# The on-disk cache (customer record, presets) coalesces writes over this
+# many seconds.
+STORE_SAVE_DELAY = 10
+
+# ---------------------------------------------------------------------------
+# Options (set from the integration's Configure dialog)
+# ---------------------------------------------------------------------------
+# Upper bound on simultaneous Kohler API requests during a poll. Device states
+# are fetched concurrently so a cycle takes roughly one round trip instead of
+# one per shower; the cap keeps large accounts from bursting the APIM gateway.
+CONF_MAX_CONCURRENT_REQUESTS = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+MAX_CONCURRENT_REQUESTS_LIMIT = 16
+# Live changes to a running shower (flow slider, target temperature, outlet)
+# settle for this many seconds before the latest value is sent, so dragging a
+# slider sends one write instead of one per step. 0 sends every change.
+CONF_LIVE_UPDATE_DELAY = "live_update_delay"
+DEFAULT_LIVE_UPDATE_DELAY = 1.0
+MAX_LIVE_UPDATE_DELAY = 10.0
+# After a command is accepted, the device is re-read in the background (first
+# after CONFIRM_INITIAL_DELAY seconds, doubling up to CONFIRM_MAX_DELAY) until
+# it reports the expected state or this many seconds pass.
+CONF_CONFIRM_TIMEOUT = "confirm_timeout"
+DEFAULT_CONFIRM_TIMEOUT = 20
+MIN_CONFIRM_TIMEOUT = 5
+MAX_CONFIRM_TIMEOUT = 120
+CONFIRM_INITIAL_DELAY = 1.0
+CONFIRM_MAX_DELAY = 5.0
 
 # ---------------------------------------------------------------------------
 # Config-entry keys
@@ -67,6 +142,9 @@ SERVICE_START_PRESET = "start_preset"
 SERVICE_START_WARMUP = "start_warmup"
 SERVICE_STOP_SHOWER = "stop_shower"
 SERVICE_PAUSE_SHOWER = "pause_shower"
+# Optional service field: send the command even if the shower already reports
+# the state it would set.
+ATTR_FORCE = "force"
 
 # ---------------------------------------------------------------------------
 # B2C sign-in (OAuth Authorization Code + PKCE) constants for the config flow.
@@ -0,0 +1,164 @@
+"""Read-only views derived from Kohler API payloads.
+
+Entities read many properties per state write, and most of them used to walk
+``state.state.valve_state`` (and convert units) on every access. A view is
+built once when a device's state changes; entities then read plain fields.
+Presets get the same treatment: label and id lookups, and each preset's
+start payload, are built when a device's presets change, not on every option
+access or start.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from kohler_anthem.models import (
+    DeviceState,
+    Preset,
+    PresetResponse,
+    ValveControlModel,
+    ValveState,
+)
+
+from .helpers import (
+    build_preset_valve_control,
+    from_celsius,
+    preset_has_valve_data,
+    valve_topology,
+)
+
+PRIMARY_VALVE = "Valve1"
+# The primary valve's outlet that reports the measured water temperature.
+PRIMARY_OUTLET = "outlet2"
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceView:
+    """Everything entities derive from one ``DeviceState``."""
+
+    valves: dict[str, ValveState]
+    # Any valve actively flowing water.
+    running: bool
+    # No valve flowing, but at least one holding a paused session.
+    paused: bool
+    warming_up: bool
+    active_preset_id: int | None
+    # Primary valve setpoint in Celsius as reported by the API (None if unset).
+    setpoint_celsius: float | None
+    # The setpoint and the measured outlet temperature in the account's unit,
+    # rounded for display.
+    target_temperature: float | None
+    outlet_temperature: float | None
+    # ``{"<valveIndex>_error_code": code}`` for every valve flagging an error.
+    error_codes: dict[str, int]
+    # What the device's OFF payload is built from (see ``valve_topology``).
+    valve_topology: tuple[tuple[str, int], ...]
+
+    @classmethod
+    def from_state(cls, state: DeviceState, temperature_unit: str) -> DeviceView:
+        """Build the view in a single pass over the valves."""
+        valves: dict[str, ValveState] = {}
+        running = paused = False
+        error_codes: dict[str, int] = {}
+        for valve in state.state.valve_state:
+            valves[valve.valve_index] = valve
+            if valve.is_active or valve.at_flow:
+                running = True
+            elif valve.pause_flag:
+                paused = True
+            if valve.error_flag:
+                error_codes[f"{valve.valve_index}_error_code"] = valve.error_code
+
+        setpoint = None
+        outlet_temp = None
+        primary = valves.get(PRIMARY_VALVE)
+        if primary is not None:
+            setpoint = primary.temperature_setpoint or None
+            for outlet in primary.outlets:
+                if outlet.outlet_index == PRIMARY_OUTLET:
+                    outlet_temp = outlet.outlet_temp or None
+                    break
+
+        # The API reports temperatures in Celsius; present them in the
+        # account's unit to match the entities' units of measurement.
+        return cls(
+            valves=valves,
+            running=running,
+            paused=paused and not running,
+            warming_up=state.is_warming_up,
+            active_preset_id=state.state.active_preset_id,
+            setpoint_celsius=setpoint,
+            target_temperature=(
+                round(from_celsius(setpoint, temperature_unit), 1)
+                if setpoint
+                else None
+            ),
+            outlet_temperature=(
+                round(from_celsius(outlet_temp, temperature_unit), 1)
+                if outlet_temp
+                else None
+            ),
+            error_codes=error_codes,
+            valve_topology=valve_topology(state),
+        )
+
+
+def preset_label(preset: Preset) -> str:
+    """Select-option label for a preset: its name plus id, so it's unique."""
+    title = preset.title or preset.logical_name
+    if title:
+        return f"{title} ({preset.preset_id})"
+    kind = "Experience" if preset.is_experience else "Preset"
+    return f"{kind} {preset.preset_id}"
+
+
+@dataclass(frozen=True, slots=True)
+class PresetIndex:
+    """Lookups over one device's presets, rebuilt only when they change."""
+
+    # Option labels in the order the Kohler app lists the presets.
+    labels: list[str]
+    # The labels of those that can be started from HA (not experiences).
+    start_labels: list[str]
+    by_label: dict[str, Preset]
+    by_id: dict[int, Preset]
+    label_by_id: dict[int, str]
+    # Preset title (or logical name) by id, for presets that have one.
+    name_by_id: dict[int, str]
+    # The solowritesystem payload that starts each preset, by id, built here
+    # so starting one needs no payload work. Experiences have none.
+    start_controls: dict[int, ValveControlModel]
+
+    @classmethod
+    def from_response(cls, response: PresetResponse | None) -> PresetIndex:
+        presets = response.presets if response is not None else []
+        by_label: dict[str, Preset] = {}
+        by_id: dict[int, Preset] = {}
+        label_by_id: dict[int, str] = {}
+        name_by_id: dict[int, str] = {}
+        start_controls: dict[int, ValveControlModel] = {}
+        startable: dict[str, bool] = {}
+        for preset in presets:
+            label = preset_label(preset)
+            by_label[label] = preset
+            startable[label] = preset_has_valve_data(preset)
+            # First match wins by id, like PresetResponse.get_preset.
+            if preset.id not in by_id:
+                by_id[preset.id] = preset
+                label_by_id[preset.id] = label
+                if preset.title or preset.logical_name:
+                    name_by_id[preset.id] = preset.title or preset.logical_name
+                if startable[label]:
+                    start_controls[preset.id] = build_preset_valve_control(preset)
+        return cls(
+            labels=list(by_label),
+            start_labels=[label for label, ok in startable.items() if ok],
+            by_label=by_label,
+            by_id=by_id,
+            label_by_id=label_by_id,
+            name_by_id=name_by_id,
+            start_controls=start_controls,
+        )
+
+
+EMPTY_PRESET_INDEX = PresetIndex.from_response(None)
@@ -0,0 +1,101 @@
+"""Diagnostics support for Kohler Konnect.
+
+The download carries the entry's settings, the account's API metrics and,
+per device, its polling state and the recent calls kept by
+:mod:`.capture`. Credentials, tokens and account identifiers are redacted.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntry
+
+from . import KohlerKonnectCoordinator
+from .const import (
+    CONF_APIM_KEY,
+    CONF_B2C_REFRESH_TOKEN,
+    CONF_TENANT_ID,
+    DOMAIN,
+)
+
+TO_REDACT = {
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    CONF_APIM_KEY,
+    CONF_B2C_REFRESH_TOKEN,
+    CONF_TENANT_ID,
+    # The same, and other account details, as the API names them.
+    "tenantId",
+    "serialNumber",
+    "homeName",
+    "homeLatitude",
+    "homeLongitude",
+    "ssid",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Diagnostics for the whole account."""
+    coordinator: KohlerKonnectCoordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "account": {
+            "temperature_unit": coordinator.temperature_unit,
+            "water_units": coordinator.water_units,
+            "devices": async_redact_data(
+                [
+                    device.model_dump(mode="json", by_alias=True)
+                    for device in coordinator.devices
+                ],
+                TO_REDACT,
+            ),
+        },
+        "metrics": coordinator.metrics.summary(),
+        "devices": {
+            device.device_id: _device_diagnostics(coordinator, device.device_id)
+            for device in coordinator.devices
+        },
+    }
+
+
+async def async_get_device_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry, device: DeviceEntry
+) -> dict[str, Any]:
+    """Diagnostics for one shower."""
+    coordinator: KohlerKonnectCoordinator = hass.data[DOMAIN][entry.entry_id]
+    device_id = next(
+        identifier for domain, identifier in device.identifiers if domain == DOMAIN
+    )
+    return _device_diagnostics(coordinator, device_id)
+
+
+def _device_diagnostics(
+    coordinator: KohlerKonnectCoordinator, device_id: str
+) -> dict[str, Any]:
+    device_coordinator = coordinator.device_coordinators[device_id]
+    capture = coordinator.capture.devices.get(device_id)
+    return async_redact_data(
+        {
+            "last_update_success": device_coordinator.last_update_success,
+            "stale": device_coordinator.stale,
+            "update_interval": (
+                device_coordinator.update_interval.total_seconds()
+                if device_coordinator.update_interval
+                else None
+            ),
+            "breaker": device_coordinator.breaker.state.value,
+            "preset_hash": coordinator.preset_hashes.get(device_id),
+            "history": capture.as_dict() if capture is not None else None,
+        },
+        TO_REDACT,
+    )
@@ -2,25 +2,44 @@
 
 from __future__ import annotations
 
+from typing import Any
+
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from kohler_anthem.models import Device, DeviceState
 
-from . import KohlerKonnectCoordinator
+from . import KohlerDeviceCoordinator, KohlerKonnectCoordinator
 from .const import DOMAIN
+from .derived import DeviceView
+
+
+class KohlerEntity(CoordinatorEntity[KohlerDeviceCoordinator]):
+    """Base entity: wires up the coordinator and shared device registry info.
 
+    Each entity listens to its own device's coordinator, so it refreshes on
+    that device's cadence; account-wide state (client, presets, runtime
+    settings) lives on the ``hub``.
 
-class KohlerEntity(CoordinatorEntity[KohlerKonnectCoordinator]):
-    """Base entity: wires up the coordinator and shared device registry info."""
+    Coordinator updates only write state when the inputs the entity derives
+    its state from changed: a poll that moves total water used needn't
+    rewrite the preset select, the warmup switch, and every other entity of
+    the device. Those inputs are compared, not HA's full property set, so an
+    update that does write evaluates the state properties only once.
+    """
 
     _attr_has_entity_name = True
 
     def __init__(
         self, coordinator: KohlerKonnectCoordinator, device: Device
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator.device_coordinators[device.device_id])
+        self.hub = coordinator
         self._device_id = device.device_id
         self._device = device
+        # Fingerprint of what was last written by a coordinator update; None
+        # forces the next update through (e.g. after an optimistic write).
+        self._written_fingerprint: tuple[Any, ...] | None = None
 
     @property
     def device_info(self) -> dict:
@@ -34,4 +53,31 @@ class KohlerEntity(CoordinatorEntity[KohlerKonnectCoordinator]):
 
     @property
     def _state(self) -> DeviceState | None:
-        return self.coordinator.data.get(self._device_id)
+        return self.coordinator.data
+
+    @property
+    def _view(self) -> DeviceView | None:
+        return self.coordinator.view
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        """What this entity's state is derived from, with its availability.
+
+        The whole view by default; entities narrow it to the fields they read
+        (or add what they read from elsewhere).
+        """
+        return (self.available, self._view)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        fingerprint = self._fingerprint()
+        if fingerprint == self._written_fingerprint:
+            return
+        super()._handle_coordinator_update()
+        self._written_fingerprint = fingerprint
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        # Writes from outside a coordinator update (optimistic UI, local
+        # settings) invalidate the fingerprint so the next poll re-syncs.
+        self._written_fingerprint = None
+        super().async_write_ha_state()
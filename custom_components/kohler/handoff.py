@@ -0,0 +1,84 @@
+"""Hand the config flow's work over to the entry's first setup.
+
+The config flow signs in, exchanges tokens and reads the customer record to
+validate the account. The entry's setup runs seconds later and used to redo
+all of it with a fresh client. Instead the flow parks its connected client and
+customer record here, keyed by the entry's unique id, and the first setup
+claims them. An offer nobody claims within ``HANDOFF_TTL`` seconds is dropped
+and its client closed.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from kohler_anthem import KohlerAnthemClient
+from kohler_anthem.models import Customer
+
+from .const import DOMAIN, HANDOFF_TTL
+
+HANDOFF_DATA = f"{DOMAIN}_handoff"
+
+
+@dataclass(slots=True)
+class SetupHandoff:
+    """What the config flow already fetched for one account."""
+
+    client: KohlerAnthemClient
+    # The refresh token the flow wrote to the entry; a claim made with any
+    # other token (the entry changed since) is refused.
+    refresh_token: str
+    customer: Customer
+    cancel_expiry: CALLBACK_TYPE | None = None
+
+
+@callback
+def async_offer_handoff(
+    hass: HomeAssistant, unique_id: str, handoff: SetupHandoff
+) -> None:
+    """Park ``handoff`` for the next setup of the entry with ``unique_id``."""
+    offers: dict[str, SetupHandoff] = hass.data.setdefault(HANDOFF_DATA, {})
+    if (previous := offers.pop(unique_id, None)) is not None:
+        _async_discard(hass, previous)
+
+    @callback
+    def _expire(_now: object) -> None:
+        if offers.get(unique_id) is handoff:
+            del offers[unique_id]
+            handoff.cancel_expiry = None
+            _async_discard(hass, handoff)
+
+    handoff.cancel_expiry = async_call_later(hass, HANDOFF_TTL, _expire)
+    offers[unique_id] = handoff
+
+
+@callback
+def async_claim_handoff(
+    hass: HomeAssistant, unique_id: str | None, refresh_token: str | None
+) -> SetupHandoff | None:
+    """Take the parked handoff for ``unique_id``, if one matches the entry."""
+    if unique_id is None:
+        return None
+    handoff = hass.data.get(HANDOFF_DATA, {}).pop(unique_id, None)
+    if handoff is None:
+        return None
+    if handoff.cancel_expiry is not None:
+        handoff.cancel_expiry()
+        handoff.cancel_expiry = None
+    if handoff.refresh_token != refresh_token:
+        _async_discard(hass, handoff)
+        return None
+    return handoff
+
+
+@callback
+def _async_discard(hass: HomeAssistant, handoff: SetupHandoff) -> None:
+    if handoff.cancel_expiry is not None:
+        handoff.cancel_expiry()
+        handoff.cancel_expiry = None
+    hass.async_create_background_task(
+        handoff.client.close(), "kohler handoff client close"
+    )
@@ -7,9 +7,10 @@ speak the same 4-byte-per-valve dialect.
 
 from __future__ import annotations
 
-from kohler_anthem import encode_valve_command
+from kohler_anthem.exceptions import KohlerAnthemError
 from kohler_anthem.models import (
     DeviceState,
+    Outlet,
     Preset,
     ValveControlModel,
     ValveMode,
@@ -32,6 +33,97 @@ VALVE_FIELD_AND_PREFIX = {
 # encode_valve_command's accepted Celsius range.
 ENCODE_TEMP_MIN_C, ENCODE_TEMP_MAX_C = 15.0, 49.0
 
+# ---------------------------------------------------------------------------
+# Valve codec
+# ---------------------------------------------------------------------------
+# A valve command is 4 bytes, ``[prefix][temp][flow][mode]``, as upper-case
+# hex. The temperature byte is ``(celsius - 25.6) * 10`` (0.1 °C steps), the
+# flow byte is ``percent * 2``. Every byte the integration can send has a
+# small, fixed domain, so each is formatted from a table built once at import
+# instead of being range-checked and formatted per command (which is what the
+# library's ``encode_valve_command`` does).
+_TEMP_OFFSET_C = 25.6
+_BYTE_HEX = tuple(f"{byte:02X}" for byte in range(256))
+_FLOW_HEX = {percent: f"{percent * 2:02X}" for percent in range(101)}
+_MODE_HEX = {mode: f"{int(mode):02X}" for mode in ValveMode}
+_PREFIX_HEX = {
+    prefix: f"{int(prefix):02X}" for _field, prefix in VALVE_FIELD_AND_PREFIX.values()
+}
+
+# The valve mode that runs each outlet, as the library's outlet_to_mode maps
+# it (the handshower shares the showerhead's mode).
+OUTLET_MODE = {
+    Outlet.SHOWERHEAD: ValveMode.SHOWER,
+    Outlet.TUB_FILLER: ValveMode.TUB_FILLER,
+    Outlet.HANDSHOWER: ValveMode.SHOWER,
+    Outlet.TUB_HANDHELD: ValveMode.TUB_HANDHELD,
+}
+
+
+def encode_valve_hex(
+    temperature_celsius: float,
+    flow_percent: int,
+    mode: ValveMode,
+    prefix: ValvePrefix = ValvePrefix.PRIMARY,
+) -> str:
+    """Encode one valve command from the lookup tables.
+
+    The temperature is clamped into the encodable range (like
+    :func:`clamp_encode_temp`) and the flow into 0-100 %. The temperature
+    byte is rounded with the library's own float arithmetic, so the result
+    is the same as ``encode_valve_command`` on the clamped values, ties
+    such as 25.75 °C included.
+    """
+    # In-range values (the common case) skip the clamping entirely.
+    if not ENCODE_TEMP_MIN_C <= temperature_celsius <= ENCODE_TEMP_MAX_C:
+        temperature_celsius = clamp_encode_temp(temperature_celsius)
+    # Like the library, setpoints below 25.6 °C floor at byte 0x00.
+    temp = _BYTE_HEX[max(round((temperature_celsius - _TEMP_OFFSET_C) * 10), 0)]
+    flow = _FLOW_HEX.get(flow_percent)
+    if flow is None:
+        flow = _FLOW_HEX[min(max(round(flow_percent), 0), 100)]
+    return _PREFIX_HEX[prefix] + temp + flow + _MODE_HEX[mode]
+
+
+def build_outlet_control(
+    outlet: Outlet, temp_c: float, flow_percent: int
+) -> ValveControlModel:
+    """The solowritesystem payload that runs ``outlet``.
+
+    What the library's ``turn_on_outlet`` sends, encoded from the tables.
+    """
+    return ValveControlModel(
+        primary_valve1=encode_valve_hex(
+            temp_c, flow_percent, OUTLET_MODE.get(outlet, ValveMode.SHOWER)
+        )
+    )
+
+
+def build_pause_control(temp_c: float, flow_percent: int) -> ValveControlModel:
+    """The solowritesystem payload that pauses the water (mode STOP).
+
+    What the library's ``pause`` sends, encoded from the tables.
+    """
+    return ValveControlModel(
+        primary_valve1=encode_valve_hex(temp_c, flow_percent, ValveMode.STOP)
+    )
+
+
+# Kohler's backend returns this when the physical device is powered off or has
+# lost its network/cloud link. It is an expected, transient condition — not an
+# error in the integration — so we surface it gently rather than as a traceback.
+KOHLER_OFFLINE_STATUS = 900
+
+
+def is_offline_error(err: KohlerAnthemError) -> bool:
+    """True if an API error means the device is offline (vs a real failure)."""
+    raw = getattr(err, "raw_response", None)
+    if isinstance(raw, dict) and raw.get("statusCode") == KOHLER_OFFLINE_STATUS:
+        return True
+    # Fallback: some responses only carry the message text.
+    text = str(raw) if raw is not None else str(err)
+    return "product is offline" in text.lower()
+
 
 def to_celsius(value: float, unit: str) -> float:
     """Convert an account-unit temperature to Celsius for library writes."""
@@ -58,7 +150,25 @@ def clamp_encode_temp(temp_c: float) -> float:
     return min(max(temp_c, ENCODE_TEMP_MIN_C), ENCODE_TEMP_MAX_C)
 
 
-def build_off_control(state: DeviceState | None, temp_c: float) -> ValveControlModel:
+def valve_topology(state: DeviceState | None) -> tuple[tuple[str, int], ...]:
+    """The ``(valveIndex, flow %)`` pairs an OFF payload is built from.
+
+    Only these (and the temperature) shape :func:`build_off_control`'s
+    result, so they key its cached copies.
+    """
+    if state is None:
+        return ()
+    return tuple(
+        # Temp/flow bytes are ignored for OFF; they just need to be valid.
+        (valve.valve_index, min(max(valve.flow_setpoint, 0), 100) or 100)
+        for valve in state.state.valve_state
+        if valve.valve_index in VALVE_FIELD_AND_PREFIX
+    )
+
+
+def build_off_control(
+    topology: tuple[tuple[str, int], ...], temp_c: float
+) -> ValveControlModel:
     """Build a solowritesystem payload that actually turns the water off.
 
     The library's ``turn_off()`` sends an all-zero ``primaryValve1``
@@ -66,30 +176,16 @@ def build_off_control(state: DeviceState | None, temp_c: float) -> ValveControlM
     byte (0x00) doesn't address any valve — which is why users could turn
     the shower on but never off. The mobile app instead sends
     ``[prefix][temp][flow]`` with mode ``0x00`` per valve (e.g.
-    ``"0179c800"``); reproduce that here for every valve the device reports.
+    ``"0179c800"``); reproduce that here for every valve in ``topology``,
+    the device's :func:`valve_topology`.
     """
-    temp_c = clamp_encode_temp(temp_c)
     kwargs: dict[str, str] = {}
-    valves = state.state.valve_state if state is not None else []
-    for valve in valves:
-        mapping = VALVE_FIELD_AND_PREFIX.get(valve.valve_index)
-        if mapping is None:
-            continue
-        field, prefix = mapping
-        # Temp/flow bytes are ignored for OFF; they just need to be valid.
-        flow = min(max(valve.flow_setpoint, 0), 100) or 100
-        kwargs[field] = encode_valve_command(
-            temperature_celsius=temp_c,
-            flow_percent=flow,
-            mode=ValveMode.OFF,
-            prefix=prefix,
-        )
+    for valve_index, flow in topology:
+        field, prefix = VALVE_FIELD_AND_PREFIX[valve_index]
+        kwargs[field] = encode_valve_hex(temp_c, flow, ValveMode.OFF, prefix)
     if "primary_valve1" not in kwargs:
-        kwargs["primary_valve1"] = encode_valve_command(
-            temperature_celsius=temp_c,
-            flow_percent=100,
-            mode=ValveMode.OFF,
-            prefix=ValvePrefix.PRIMARY,
+        kwargs["primary_valve1"] = encode_valve_hex(
+            temp_c, 100, ValveMode.OFF, ValvePrefix.PRIMARY
         )
     return ValveControlModel(**kwargs)
 
@@ -139,5 +235,5 @@ def build_preset_valve_control(preset: Preset) -> ValveControlModel:
         # Carry the preset's own temp+flow bytes through unchanged; only the
         # prefix and the mode byte are ours to set.
         temp_flow = hex_string[2:6]
-        kwargs[field] = f"{int(prefix):02X}{temp_flow}{int(ValveMode.SHOWER):02X}"
+        kwargs[field] = _PREFIX_HEX[prefix] + temp_flow + _MODE_HEX[ValveMode.SHOWER]
     return ValveControlModel(**kwargs)
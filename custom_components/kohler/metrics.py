@@ -0,0 +1,328 @@
+"""Latency and outcome instrumentation for Kohler API calls.
+
+Nothing used to record how long the cloud took to answer or how often it
+failed, so poll intervals were sized against the APIM gateway's limits by
+guesswork. Every client call the integration makes now goes through
+:meth:`ApiMetrics.instrument`'s wrappers (and token renewals through
+:meth:`ApiMetrics.track`), which time it and count its outcome in two sets of
+histograms: one per endpoint and one per device.
+
+Each histogram keeps fixed latency buckets in one slot per minute over a
+rolling ``METRICS_WINDOW`` minutes, so memory is bounded however busy the
+account is. Percentiles are estimated from the buckets the way Prometheus'
+``histogram_quantile`` does. Totals since startup are kept alongside for the
+metrics endpoint, whose counters must never go down.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
+from functools import wraps
+from typing import Any, TypeVar
+
+from kohler_anthem import KohlerAnthemClient
+from kohler_anthem.exceptions import KohlerAnthemError
+
+from .const import LATENCY_BUCKETS, METRICS_WINDOW
+from .helpers import is_offline_error
+
+_T = TypeVar("_T")
+
+# The client methods the integration calls. Every valve write (turn-on,
+# pause, OFF, preset start) is a control_valve call carrying its hex.
+INSTRUMENTED_CALLS = (
+    "get_customer",
+    "get_device_state",
+    "get_presets",
+    "control_valve",
+    "start_preset",
+    "stop_preset",
+    "start_warmup",
+    "stop_warmup",
+)
+
+
+class CallOutcome(StrEnum):
+    """How an API call ended."""
+
+    OK = "ok"
+    # The cloud answered that the device is offline.
+    OFFLINE = "offline"
+    ERROR = "error"
+
+
+@dataclass(slots=True)
+class _Slot:
+    """One minute's calls."""
+
+    minute: int
+    buckets: list[int]
+    calls: int = 0
+    errors: int = 0
+    offline: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class LatencyStats:
+    """A histogram's figures over the rolling window."""
+
+    calls: int
+    calls_per_hour: float
+    # Fraction of calls that failed (offline responses not included).
+    error_rate: float | None
+    offline_rate: float | None
+    # Seconds; None when there were no calls.
+    p50: float | None
+    p95: float | None
+
+
+@dataclass(slots=True)
+class LatencyHistogram:
+    """Rolling and lifetime latency buckets for one endpoint or device."""
+
+    _slots: deque[_Slot] = field(default_factory=lambda: deque(maxlen=METRICS_WINDOW))
+    # Lifetime totals (the metrics endpoint's counters).
+    total_buckets: list[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1)
+    )
+    total_seconds: float = 0.0
+    total_outcomes: dict[CallOutcome, int] = field(
+        default_factory=lambda: dict.fromkeys(CallOutcome, 0)
+    )
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.total_outcomes.values())
+
+    def record(self, seconds: float, outcome: CallOutcome, now: float) -> None:
+        minute = int(now // 60)
+        if not self._slots or self._slots[-1].minute != minute:
+            self._slots.append(_Slot(minute, [0] * (len(LATENCY_BUCKETS) + 1)))
+        slot = self._slots[-1]
+        bucket = _bucket_index(seconds)
+        slot.buckets[bucket] += 1
+        slot.calls += 1
+        if outcome is CallOutcome.ERROR:
+            slot.errors += 1
+        elif outcome is CallOutcome.OFFLINE:
+            slot.offline += 1
+        self.total_buckets[bucket] += 1
+        self.total_seconds += seconds
+        self.total_outcomes[outcome] += 1
+
+    def stats(self, now: float) -> LatencyStats:
+        """Figures over the last ``METRICS_WINDOW`` minutes."""
+        oldest = int(now // 60) - METRICS_WINDOW + 1
+        buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        calls = errors = offline = 0
+        first_minute: int | None = None
+        for slot in self._slots:
+            if slot.minute < oldest:
+                continue
+            if first_minute is None:
+                first_minute = slot.minute
+            calls += slot.calls
+            errors += slot.errors
+            offline += slot.offline
+            for index, count in enumerate(slot.buckets):
+                buckets[index] += count
+        if not calls:
+            return LatencyStats(0, 0.0, None, None, None, None)
+        # Scale by the time actually covered, so a fresh start doesn't report
+        # an hour's rate from its first few minutes' calls as a tiny one.
+        covered_minutes = int(now // 60) - first_minute + 1
+        return LatencyStats(
+            calls=calls,
+            calls_per_hour=round(calls * 60 / covered_minutes, 1),
+            error_rate=errors / calls,
+            offline_rate=offline / calls,
+            p50=_quantile(buckets, calls, 0.5),
+            p95=_quantile(buckets, calls, 0.95),
+        )
+
+
+def _bucket_index(seconds: float) -> int:
+    for index, bound in enumerate(LATENCY_BUCKETS):
+        if seconds <= bound:
+            return index
+    return len(LATENCY_BUCKETS)
+
+
+def _quantile(buckets: list[int], calls: int, q: float) -> float:
+    """Estimate quantile ``q`` by interpolating within its bucket."""
+    rank = q * calls
+    seen = 0
+    for index, count in enumerate(buckets):
+        if count and seen + count >= rank:
+            if index == len(LATENCY_BUCKETS):
+                # The overflow bucket has no upper bound to interpolate to.
+                return LATENCY_BUCKETS[-1]
+            lower = LATENCY_BUCKETS[index - 1] if index else 0.0
+            upper = LATENCY_BUCKETS[index]
+            return lower + (upper - lower) * (rank - seen) / count
+        seen += count
+    return LATENCY_BUCKETS[-1]
+
+
+@dataclass(frozen=True, slots=True)
+class ApiCall:
+    """One finished client call, as handed to :class:`ApiMetrics` observers."""
+
+    endpoint: str
+    device_id: str | None
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+    # The call's return value (None if it raised).
+    result: Any
+    error: BaseException | None
+    outcome: CallOutcome
+    seconds: float
+
+
+class ApiMetrics:
+    """Latency histograms per endpoint and per device for one account."""
+
+    def __init__(self) -> None:
+        self.endpoints: dict[str, LatencyHistogram] = {}
+        self.devices: dict[str, LatencyHistogram] = {}
+        # Called with every instrumented client call once it finishes.
+        self.observers: list[Callable[[ApiCall], None]] = []
+
+    def record(
+        self,
+        endpoint: str,
+        device_id: str | None,
+        seconds: float,
+        outcome: CallOutcome,
+    ) -> None:
+        now = time.monotonic()
+        _histogram(self.endpoints, endpoint).record(seconds, outcome, now)
+        if device_id is not None:
+            _histogram(self.devices, device_id).record(seconds, outcome, now)
+
+    async def track(
+        self,
+        endpoint: str,
+        device_id: str | None,
+        awaitable: Awaitable[_T],
+        call: tuple[tuple[Any, ...], dict[str, Any]] | None = None,
+    ) -> _T:
+        """Await ``awaitable``, recording its latency and outcome.
+
+        ``call`` is the client call's ``(args, kwargs)``, passed on to the
+        observers.
+        """
+        start = time.monotonic()
+        try:
+            result = await awaitable
+        except asyncio.CancelledError:
+            # Abandoned, not answered: says nothing about the API.
+            raise
+        except Exception as err:
+            outcome = (
+                CallOutcome.OFFLINE
+                if isinstance(err, KohlerAnthemError) and is_offline_error(err)
+                else CallOutcome.ERROR
+            )
+            self._finish(endpoint, device_id, start, outcome, call, None, err)
+            raise
+        self._finish(endpoint, device_id, start, CallOutcome.OK, call, result, None)
+        return result
+
+    def _finish(
+        self,
+        endpoint: str,
+        device_id: str | None,
+        start: float,
+        outcome: CallOutcome,
+        call: tuple[tuple[Any, ...], dict[str, Any]] | None,
+        result: Any,
+        error: BaseException | None,
+    ) -> None:
+        seconds = time.monotonic() - start
+        self.record(endpoint, device_id, seconds, outcome)
+        if self.observers:
+            args, kwargs = call if call is not None else ((), {})
+            finished = ApiCall(
+                endpoint, device_id, args, kwargs, result, error, outcome, seconds
+            )
+            for observer in self.observers:
+                observer(finished)
+
+    def instrument(self, client: KohlerAnthemClient) -> None:
+        """Route the client's API methods through :meth:`track`.
+
+        The wrappers are set on the instance, so every caller holding the
+        client (coordinators, entities, command factories) is measured.
+        """
+        for name in INSTRUMENTED_CALLS:
+            method = getattr(client, name, None)
+            if method is None:
+                continue
+            setattr(client, name, self._wrap(name, method))
+
+    def _wrap(
+        self, endpoint: str, method: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        parameters = list(inspect.signature(method).parameters)
+        position = (
+            parameters.index("device_id") if "device_id" in parameters else None
+        )
+
+        @wraps(method)
+        async def _tracked(*args: Any, **kwargs: Any) -> Any:
+            device_id = kwargs.get("device_id")
+            if device_id is None and position is not None and len(args) > position:
+                device_id = args[position]
+            return await self.track(
+                endpoint, device_id, method(*args, **kwargs), (args, kwargs)
+            )
+
+        return _tracked
+
+    def summary(self) -> dict[str, Any]:
+        """Every endpoint's and device's figures, for attributes and logs."""
+        now = time.monotonic()
+        return {
+            "endpoints": {
+                endpoint: _stats_dict(histogram.stats(now))
+                for endpoint, histogram in sorted(self.endpoints.items())
+            },
+            "devices": {
+                device_id: _stats_dict(histogram.stats(now))
+                for device_id, histogram in sorted(self.devices.items())
+            },
+        }
+
+    def device_stats(self, device_id: str) -> LatencyStats:
+        histogram = self.devices.get(device_id)
+        if histogram is None:
+            return LatencyStats(0, 0.0, None, None, None, None)
+        return histogram.stats(time.monotonic())
+
+
+def _histogram(histograms: dict[str, LatencyHistogram], key: str) -> LatencyHistogram:
+    if (histogram := histograms.get(key)) is None:
+        histogram = histograms[key] = LatencyHistogram()
+    return histogram
+
+
+def _stats_dict(stats: LatencyStats) -> dict[str, Any]:
+    return {
+        "calls": stats.calls,
+        "calls_per_hour": stats.calls_per_hour,
+        "error_rate": _round(stats.error_rate, 4),
+        "offline_rate": _round(stats.offline_rate, 4),
+        "p50_ms": _round(stats.p50 and stats.p50 * 1000, 1),
+        "p95_ms": _round(stats.p95 and stats.p95 * 1000, 1),
+    }
+
+
+def _round(value: float | None, digits: int) -> float | None:
+    return None if value is None else round(value, digits)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import PERCENTAGE
@@ -47,11 +49,14 @@ class KohlerFlowNumber(KohlerEntity, NumberEntity):
 
     @property
     def native_value(self) -> float:
-        return float(self.coordinator.runtime[self._device_id].flow_percent)
+        return float(self.hub.runtime[self._device_id].flow_percent)
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        return (self.available, self.hub.runtime[self._device_id].flow_percent)
 
     async def async_set_native_value(self, value: float) -> None:
-        self.coordinator.runtime[self._device_id].flow_percent = int(value)
+        self.hub.runtime[self._device_id].flow_percent = int(value)
         self.async_write_ha_state()
-        await self.coordinator.async_apply_runtime(
+        await self.hub.async_apply_runtime(
             self._device_id, f"set flow to {int(value)}%"
         )
@@ -0,0 +1,235 @@
+"""Prometheus text-format metrics for the Kohler integration.
+
+Serves ``/api/kohler/metrics`` (behind HA's usual auth, so scrape it with a
+long-lived access token as the bearer token). The page is rendered from what
+the coordinators already hold: the API metrics, poll timings, breakers and
+command queues. Rendering never calls Kohler's API, so scraping costs no
+requests against the APIM quota.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, LATENCY_BUCKETS
+from .metrics import LatencyHistogram
+
+if TYPE_CHECKING:
+    from . import KohlerKonnectCoordinator
+
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+METRICS_VIEW_DATA = f"{DOMAIN}_metrics_view"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+TOKEN_ENDPOINT_PREFIX = "token_refresh_"
+
+
+class KohlerMetricsView(HomeAssistantView):
+    """Every loaded Kohler account's metrics, in Prometheus text format."""
+
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+    requires_auth = True
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+
+    async def get(self, request: web.Request) -> web.Response:
+        coordinators: dict[str, KohlerKonnectCoordinator] = self._hass.data.get(
+            DOMAIN, {}
+        )
+        return web.Response(
+            body=render_metrics(coordinators).encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+
+@callback
+def async_register_metrics_view(hass: HomeAssistant) -> None:
+    """Register the view once; it serves whichever entries are loaded."""
+    if hass.data.get(METRICS_VIEW_DATA):
+        return
+    hass.http.register_view(KohlerMetricsView(hass))
+    hass.data[METRICS_VIEW_DATA] = True
+
+
+def render_metrics(coordinators: dict[str, KohlerKonnectCoordinator]) -> str:
+    """The exposition text for every account (entry id → hub)."""
+    lines: list[str] = []
+    now = time.monotonic()
+
+    def family(name: str, kind: str, help_text: str) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def sample(name: str, labels: dict[str, str], value: float) -> None:
+        lines.append(f"{name}{_labels(labels)} {_number(value)}")
+
+    family(
+        "kohler_poll_duration_seconds",
+        "histogram",
+        "Device state poll duration, including waiting for a request slot.",
+    )
+    for entry_id, hub in coordinators.items():
+        for device_id, device in hub.device_coordinators.items():
+            _histogram_samples(
+                lines,
+                "kohler_poll_duration_seconds",
+                {"entry": entry_id, "device": device_id},
+                device.poll_durations,
+            )
+
+    family(
+        "kohler_last_success_age_seconds",
+        "gauge",
+        "Seconds since the device's state was last read successfully.",
+    )
+    for entry_id, hub in coordinators.items():
+        for device_id, device in hub.device_coordinators.items():
+            if device.last_success_at is not None:
+                sample(
+                    "kohler_last_success_age_seconds",
+                    {"entry": entry_id, "device": device_id},
+                    now - device.last_success_at,
+                )
+
+    family(
+        "kohler_device_offline_count",
+        "gauge",
+        "Consecutive offline responses from the device (0 when online).",
+    )
+    for entry_id, hub in coordinators.items():
+        for device_id, device in hub.device_coordinators.items():
+            sample(
+                "kohler_device_offline_count",
+                {"entry": entry_id, "device": device_id},
+                device.breaker.offline_count,
+            )
+
+    family(
+        "kohler_command_queue_depth",
+        "gauge",
+        "Commands waiting to be sent to the device, plus the one in flight.",
+    )
+    for entry_id, hub in coordinators.items():
+        for device_id, queue in hub.command_queues.items():
+            sample(
+                "kohler_command_queue_depth",
+                {"entry": entry_id, "device": device_id},
+                queue.depth,
+            )
+
+    family(
+        "kohler_api_calls_total",
+        "counter",
+        "Kohler API calls by endpoint and outcome (token renewals included).",
+    )
+    for entry_id, hub in coordinators.items():
+        for endpoint, histogram in sorted(hub.metrics.endpoints.items()):
+            for outcome, count in histogram.total_outcomes.items():
+                sample(
+                    "kohler_api_calls_total",
+                    {"entry": entry_id, "endpoint": endpoint, "outcome": outcome},
+                    count,
+                )
+
+    family(
+        "kohler_api_latency_seconds",
+        "histogram",
+        "Kohler API call latency by endpoint.",
+    )
+    for entry_id, hub in coordinators.items():
+        for endpoint, histogram in sorted(hub.metrics.endpoints.items()):
+            _histogram_samples(
+                lines,
+                "kohler_api_latency_seconds",
+                {"entry": entry_id, "endpoint": endpoint},
+                histogram,
+            )
+
+    family(
+        "kohler_device_api_calls_total",
+        "counter",
+        "Kohler API calls made for each device, by outcome.",
+    )
+    for entry_id, hub in coordinators.items():
+        for device_id, histogram in sorted(hub.metrics.devices.items()):
+            for outcome, count in histogram.total_outcomes.items():
+                sample(
+                    "kohler_device_api_calls_total",
+                    {"entry": entry_id, "device": device_id, "outcome": outcome},
+                    count,
+                )
+
+    family(
+        "kohler_device_api_latency_seconds",
+        "histogram",
+        "Kohler API call latency for each device.",
+    )
+    for entry_id, hub in coordinators.items():
+        for device_id, histogram in sorted(hub.metrics.devices.items()):
+            _histogram_samples(
+                lines,
+                "kohler_device_api_latency_seconds",
+                {"entry": entry_id, "device": device_id},
+                histogram,
+            )
+
+    family(
+        "kohler_token_refresh_total",
+        "counter",
+        "Background access-token renewals by token and outcome.",
+    )
+    for entry_id, hub in coordinators.items():
+        for endpoint, histogram in sorted(hub.metrics.endpoints.items()):
+            if not endpoint.startswith(TOKEN_ENDPOINT_PREFIX):
+                continue
+            token = endpoint.removeprefix(TOKEN_ENDPOINT_PREFIX)
+            for outcome, count in histogram.total_outcomes.items():
+                sample(
+                    "kohler_token_refresh_total",
+                    {"entry": entry_id, "token": token, "outcome": outcome},
+                    count,
+                )
+
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _histogram_samples(
+    lines: list[str],
+    name: str,
+    labels: dict[str, str],
+    histogram: LatencyHistogram,
+) -> None:
+    cumulative = 0
+    for bound, count in zip(
+        (*LATENCY_BUCKETS, float("inf")), histogram.total_buckets, strict=True
+    ):
+        cumulative += count
+        bucket_labels = {**labels, "le": _number(bound)}
+        lines.append(f"{name}_bucket{_labels(bucket_labels)} {cumulative}")
+    lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.total_seconds)}")
+    lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+
+
+def _labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return f"{{{body}}}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
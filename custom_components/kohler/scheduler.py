@@ -0,0 +1,140 @@
+"""Activity-driven poll scheduling for Kohler Konnect devices.
+
+An idle shower's state doesn't change for hours, while a running one changes
+every few seconds. Rather than polling every device at one fixed rate, each
+device's next poll is picked from what its last ``DeviceState`` said it was
+doing.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import UTC, datetime, timedelta
+from enum import StrEnum
+
+from kohler_anthem.models import DeviceState, SystemState
+
+from .const import (
+    ACTIVE_SCAN_INTERVAL,
+    BREAKER_BASE_BACKOFF,
+    BREAKER_MAX_BACKOFF,
+    IDLE_SCAN_INTERVAL,
+    OFFLINE_BREAKER_THRESHOLD,
+    OFFLINE_SCAN_INTERVAL,
+    POLL_JITTER,
+    SCAN_INTERVAL,
+)
+
+
+class PollActivity(StrEnum):
+    """What a device was last seen doing, coarsest-grained first."""
+
+    ACTIVE = "active"  # warming up or water flowing
+    SESSION = "session"  # shower session open but nothing flowing (paused)
+    IDLE = "idle"  # normalOperation, nothing happening
+    OFFLINE = "offline"  # last read reported the device offline
+
+
+ACTIVITY_INTERVALS = {
+    PollActivity.ACTIVE: ACTIVE_SCAN_INTERVAL,
+    PollActivity.SESSION: SCAN_INTERVAL,
+    PollActivity.IDLE: IDLE_SCAN_INTERVAL,
+    PollActivity.OFFLINE: OFFLINE_SCAN_INTERVAL,
+}
+
+
+def classify_activity(state: DeviceState | None, offline: bool = False) -> PollActivity:
+    """Classify a device from its last state read."""
+    if offline:
+        return PollActivity.OFFLINE
+    if state is None:
+        # Nothing read yet: poll at the normal rate until we know more.
+        return PollActivity.SESSION
+    if state.is_warming_up or any(
+        valve.is_active or valve.at_flow for valve in state.state.valve_state
+    ):
+        return PollActivity.ACTIVE
+    if state.state.current_system_state == SystemState.NORMAL:
+        return PollActivity.IDLE
+    return PollActivity.SESSION
+
+
+class PollSchedule:
+    """One device's polling cadence.
+
+    The interval follows the device's activity. Each device also gets a phase
+    offset (a fraction of its interval, applied to its first scheduled poll)
+    and a little random jitter on every poll, so an account's devices spread
+    their requests over the interval instead of hitting Kohler's APIM gateway
+    as one synchronized burst.
+    """
+
+    def __init__(self, phase: float = 0.0, jitter: float = POLL_JITTER) -> None:
+        self._phase = phase
+        self._jitter = jitter
+        self.activity = PollActivity.SESSION
+
+    def next_interval(self, state: DeviceState | None, offline: bool = False) -> float:
+        """Seconds until the next poll, given the outcome of this one."""
+        self.activity = classify_activity(state, offline)
+        base = ACTIVITY_INTERVALS[self.activity]
+        delay = base * random.uniform(1.0 - self._jitter, 1.0 + self._jitter)
+        if self._phase:
+            delay += base * self._phase
+            self._phase = 0.0
+        return max(delay, 1.0)
+
+
+class BreakerState(StrEnum):
+    """Whether a device is being polled normally or only probed."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+
+
+class OfflineBreaker:
+    """Per-device circuit breaker for showers that stay offline.
+
+    A powered-off shower answers every state read with Kohler's offline status
+    (900), so polling it on the normal schedule is a wasted round trip each
+    time. After ``OFFLINE_BREAKER_THRESHOLD`` consecutive offline responses the
+    breaker opens: regular polling stops and the device is only probed, with
+    the gap between probes doubling from ``BREAKER_BASE_BACKOFF`` up to
+    ``BREAKER_MAX_BACKOFF``. The first successful read closes it again.
+    """
+
+    def __init__(self) -> None:
+        self.state = BreakerState.CLOSED
+        self.offline_count = 0
+        self.backoff = 0.0
+        self.next_probe_at: datetime | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.state is BreakerState.OPEN
+
+    def record_offline(self) -> float | None:
+        """Count an offline response.
+
+        Returns the delay until the next probe while the breaker is open, or
+        ``None`` while it is still closed (poll on the regular schedule).
+        """
+        self.offline_count += 1
+        if self.state is BreakerState.CLOSED:
+            if self.offline_count < OFFLINE_BREAKER_THRESHOLD:
+                return None
+            self.state = BreakerState.OPEN
+            self.backoff = float(BREAKER_BASE_BACKOFF)
+        else:
+            self.backoff = min(self.backoff * 2, float(BREAKER_MAX_BACKOFF))
+        self.next_probe_at = datetime.now(UTC) + timedelta(seconds=self.backoff)
+        return self.backoff
+
+    def record_success(self) -> bool:
+        """Close the breaker after a good read. True if it had been open."""
+        was_open = self.is_open
+        self.state = BreakerState.CLOSED
+        self.offline_count = 0
+        self.backoff = 0.0
+        self.next_probe_at = None
+        return was_open
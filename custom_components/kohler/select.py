@@ -3,16 +3,19 @@
 from __future__ import annotations
 
 import logging
+from typing import Any
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from kohler_anthem.models import Outlet, Preset
+from kohler_anthem.models import Device, Outlet
 
-from . import KohlerKonnectCoordinator, run_device_command
+from . import KohlerKonnectCoordinator
+from .commands import CommandOutcome
 from .const import DOMAIN
+from .derived import PresetIndex
 from .entity import KohlerEntity
 
 _LOGGER = logging.getLogger(__name__)
@@ -44,70 +47,79 @@ async def async_setup_entry(
 
 
 class KohlerPresetSelect(KohlerEntity, SelectEntity):
-    """Start/stop the shower's presets and experiences.
+    """Start/stop the shower's presets.
 
     Options mirror the presets configured in the Kohler app. Selecting one
     starts it (controlpresetorexperience + valve activation); selecting
-    "none" stops the running preset.
+    "none" stops the running preset. Experiences can't be started from HA,
+    so they aren't offered (the active-preset sensor still names one that
+    was started in the app).
     """
 
     _attr_name = "Preset"
     _attr_icon = "mdi:playlist-play"
 
+    def __init__(
+        self, coordinator: KohlerKonnectCoordinator, device: Device
+    ) -> None:
+        super().__init__(coordinator, device)
+        self._options_index: PresetIndex | None = None
+        self._options: list[str] = [PRESET_NONE]
+
     @property
     def unique_id(self) -> str:
         return f"{self._device_id}_preset_select"
 
-    def _label_for(self, preset: Preset) -> str:
-        title = preset.title or preset.logical_name
-        if title:
-            return f"{title} ({preset.preset_id})"
-        kind = "Experience" if preset.is_experience else "Preset"
-        return f"{kind} {preset.preset_id}"
-
-    def _labels_to_presets(self) -> dict[str, Preset]:
-        response = self.coordinator.presets.get(self._device_id)
-        if response is None:
-            return {}
-        return {self._label_for(p): p for p in response.presets}
-
     @property
     def options(self) -> list[str]:
-        return [PRESET_NONE, *self._labels_to_presets()]
+        index = self.hub.preset_index(self._device_id)
+        # Rebuild the list only when the preset index itself was replaced.
+        if index is not self._options_index:
+            self._options_index = index
+            self._options = [PRESET_NONE, *index.start_labels]
+        return self._options
 
     @property
     def current_option(self) -> str | None:
-        state = self._state
-        if state is None:
+        view = self._view
+        if view is None:
             return None
-        active_id = state.state.active_preset_id
+        active_id = view.active_preset_id
         if active_id is None:
             return PRESET_NONE
-        for label, preset in self._labels_to_presets().items():
-            if preset.id == active_id:
-                return label
-        # Active preset we don't have metadata for (e.g. cache still warming).
-        return None
+        # None for an active preset we don't have metadata for (e.g. cache
+        # still warming), or an experience started in the app. Startable
+        # presets are exactly those with a start payload.
+        index = self.hub.preset_index(self._device_id)
+        if active_id not in index.start_controls:
+            return None
+        return index.label_by_id[active_id]
 
-    async def async_select_option(self, option: str) -> None:
-        client = self.coordinator.client
-        tenant_id = self.coordinator.tenant_id
+    def _fingerprint(self) -> tuple[Any, ...]:
+        return (self.available, self.current_option, self.options)
 
+    async def async_select_option(self, option: str) -> None:
         if option == PRESET_NONE:
-            await run_device_command(
-                client.stop_preset(tenant_id, self._device_id), "stop preset"
+            await self.hub.async_send(
+                self._device_id,
+                "stop preset",
+                lambda: self.hub.client.stop_preset(
+                    self.hub.tenant_id, self._device_id
+                ),
             )
-            await self.coordinator.async_request_refresh()
+            await self.hub.async_refresh_device(self._device_id)
             return
 
-        preset = self._labels_to_presets().get(option)
+        preset = self.hub.preset_index(self._device_id).by_label.get(option)
         if preset is None:
             _LOGGER.warning("Unknown Kohler preset option selected: %s", option)
             return
         # async_start_preset does the correct two-step (select + mode-0x01 valve
         # write) and raises a clear error for experiences, which can't be
-        # started from HA. It requests a refresh itself.
-        await self.coordinator.async_start_preset(self._device_id, preset)
+        # started from HA.
+        outcome = await self.hub.async_start_preset(self._device_id, preset)
+        if outcome is CommandOutcome.SENT:
+            await self.hub.async_refresh_device(self._device_id)
 
 
 class KohlerOutletSelect(KohlerEntity, SelectEntity):
@@ -128,15 +140,18 @@ class KohlerOutletSelect(KohlerEntity, SelectEntity):
 
     @property
     def current_option(self) -> str:
-        outlet = self.coordinator.runtime[self._device_id].outlet
+        outlet = self.hub.runtime[self._device_id].outlet
         for label, value in OUTLET_OPTIONS.items():
             if value == outlet:
                 return label
         return next(iter(OUTLET_OPTIONS))
 
+    def _fingerprint(self) -> tuple[Any, ...]:
+        return (self.available, self.hub.runtime[self._device_id].outlet)
+
     async def async_select_option(self, option: str) -> None:
-        self.coordinator.runtime[self._device_id].outlet = OUTLET_OPTIONS[option]
+        self.hub.runtime[self._device_id].outlet = OUTLET_OPTIONS[option]
         self.async_write_ha_state()
-        await self.coordinator.async_apply_runtime(
+        await self.hub.async_apply_runtime(
             self._device_id, f"switch outlet to {option}"
         )
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -10,18 +11,30 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature, UnitOfVolume
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    PERCENTAGE,
+    UnitOfTemperature,
+    UnitOfTime,
+    UnitOfVolume,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 
 from kohler_anthem import gallons_to_liters
 
 from . import KohlerKonnectCoordinator
-from .const import DOMAIN
+from .const import DOMAIN, METRICS_SENSOR_INTERVAL
 from .entity import KohlerEntity
-from .helpers import from_celsius
+from .scheduler import BreakerState
+
 
-KohlerBaseSensor = KohlerEntity  # retained name; all sensors share the base
+class KohlerBaseSensor(KohlerEntity):
+    """Base for the sensors: each one's state is just its native value."""
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        return (self.available, self.native_value)
 
 
 async def async_setup_entry(
@@ -42,6 +55,12 @@ async def async_setup_entry(
             KohlerSystemStateSensor(coordinator, device),
             KohlerTotalWaterSensor(coordinator, device),
             KohlerLastConnectedSensor(coordinator, device),
+            KohlerPollingBreakerSensor(coordinator, device),
+            KohlerNextProbeSensor(coordinator, device),
+            KohlerApiLatencyP50Sensor(coordinator, device),
+            KohlerApiLatencyP95Sensor(coordinator, device),
+            KohlerApiErrorRateSensor(coordinator, device),
+            KohlerApiCallRateSensor(coordinator, device),
         ]
     async_add_entities(entities)
 
@@ -63,6 +82,15 @@ class KohlerConnectionSensor(KohlerBaseSensor, SensorEntity):
             return None
         return state.connection_state.value
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        # True until the first live read replaces the state restored from
+        # disk at startup.
+        return {"stale": self.coordinator.stale}
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        return (*super()._fingerprint(), self.coordinator.stale)
+
 
 class KohlerTargetTemperatureSensor(KohlerBaseSensor, SensorEntity):
     """Reports the primary valve's target temperature in the account's unit."""
@@ -74,7 +102,7 @@ class KohlerTargetTemperatureSensor(KohlerBaseSensor, SensorEntity):
     @property
     def native_unit_of_measurement(self) -> str:
         # The API returns the setpoint in the account's unit; label it to match.
-        if self.coordinator.temperature_unit == "Fahrenheit":
+        if self.hub.temperature_unit == "Fahrenheit":
             return UnitOfTemperature.FAHRENHEIT
         return UnitOfTemperature.CELSIUS
 
@@ -84,20 +112,12 @@ class KohlerTargetTemperatureSensor(KohlerBaseSensor, SensorEntity):
 
     @property
     def native_value(self) -> float | None:
-        state = self._state
-        if state is None:
+        # Already converted from the API's Celsius into the account's unit,
+        # matching native_unit_of_measurement.
+        view = self._view
+        if view is None:
             return None
-        for valve in state.state.valve_state:
-            if valve.valve_index == "Valve1":
-                setpoint = valve.temperature_setpoint
-                if not setpoint:
-                    return None
-                # The API reports the setpoint in Celsius; present it in the
-                # account's unit to match native_unit_of_measurement.
-                return round(
-                    from_celsius(setpoint, self.coordinator.temperature_unit), 1
-                )
-        return None
+        return view.target_temperature
 
 
 class KohlerWarmupStateSensor(KohlerBaseSensor, SensorEntity):
@@ -130,19 +150,13 @@ class KohlerActivePresetSensor(KohlerBaseSensor, SensorEntity):
 
     @property
     def native_value(self) -> str:
-        state = self._state
-        if state is None:
-            return "none"
-        preset_id = state.state.active_preset_id
-        if preset_id is None:
+        view = self._view
+        if view is None or view.active_preset_id is None:
             return "none"
+        preset_id = view.active_preset_id
         # Enrich the raw id with the preset's name when the cache has it.
-        response = self.coordinator.presets.get(self._device_id)
-        if response is not None:
-            preset = response.get_preset(preset_id)
-            if preset is not None and (preset.title or preset.logical_name):
-                return preset.title or preset.logical_name
-        return str(preset_id)
+        name = self.hub.preset_index(self._device_id).name_by_id.get(preset_id)
+        return name or str(preset_id)
 
 
 class KohlerSystemStateSensor(KohlerBaseSensor, SensorEntity):
@@ -186,7 +200,7 @@ class KohlerTotalWaterSensor(KohlerBaseSensor, SensorEntity):
     def native_unit_of_measurement(self) -> str:
         # totalFlow is reported in US gallons; convert to litres for metric
         # ("Liters") accounts.
-        if self.coordinator.water_units == "Liters":
+        if self.hub.water_units == "Liters":
             return UnitOfVolume.LITERS
         return UnitOfVolume.GALLONS
 
@@ -200,7 +214,7 @@ class KohlerTotalWaterSensor(KohlerBaseSensor, SensorEntity):
         if state is None:
             return None
         gallons = state.state.total_flow
-        if self.coordinator.water_units == "Liters":
+        if self.hub.water_units == "Liters":
             return round(gallons_to_liters(gallons), 1)
         return round(gallons, 1)
 
@@ -226,3 +240,162 @@ class KohlerLastConnectedSensor(KohlerBaseSensor, SensorEntity):
         if epoch > 10**12:
             epoch //= 1000
         return datetime.fromtimestamp(epoch, tz=UTC)
+
+
+class KohlerPollingBreakerSensor(KohlerBaseSensor, SensorEntity):
+    """Diagnostic: whether the device is polled normally or only probed.
+
+    ``open`` means the shower kept reporting offline, so regular polling has
+    stopped and it is probed with backoff until it answers again.
+    """
+
+    _attr_name = "Polling Breaker"
+    _attr_icon = "mdi:electric-switch"
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [state.value for state in BreakerState]
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._device_id}_polling_breaker"
+
+    @property
+    def available(self) -> bool:
+        # Most useful exactly when the device can't be read, so stay available.
+        return True
+
+    @property
+    def native_value(self) -> str:
+        return self.coordinator.breaker.state.value
+
+
+class KohlerNextProbeSensor(KohlerBaseSensor, SensorEntity):
+    """Diagnostic: when an offline device will next be probed (breaker open)."""
+
+    _attr_name = "Next Probe"
+    _attr_icon = "mdi:timer-sand"
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._device_id}_next_probe"
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @property
+    def native_value(self) -> datetime | None:
+        return self.coordinator.breaker.next_probe_at
+
+
+class KohlerApiMetricSensor(KohlerBaseSensor, SensorEntity):
+    """Diagnostic: one figure about this device's API calls over the last hour.
+
+    Covers every call made for the device (state reads, preset fetches and
+    commands). Disabled by default; per-endpoint figures are on the hub's
+    ``metrics``. The figure is ``stats.<_field>`` times ``_scale``, rounded
+    to ``_digits``. It is also recomputed on a timer: an idle device's
+    coordinator may not update for a long time, while its window keeps
+    moving.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _metric: str
+    _field: str
+    _scale: float = 1
+    _digits: int | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass,
+                self._async_recompute,
+                timedelta(seconds=METRICS_SENSOR_INTERVAL),
+            )
+        )
+
+    @callback
+    def _async_recompute(self, _now: datetime) -> None:
+        # Written only if a figure changed, like a coordinator update.
+        self._handle_coordinator_update()
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._device_id}_api_{self._metric}"
+
+    @property
+    def available(self) -> bool:
+        # Failing calls are what these measure, so stay available.
+        return True
+
+    @property
+    def native_value(self) -> float | None:
+        stats = self.hub.metrics.device_stats(self._device_id)
+        value = getattr(stats, self._field)
+        return None if value is None else round(value * self._scale, self._digits)
+
+
+class KohlerApiLatencyP50Sensor(KohlerApiMetricSensor):
+    """Median API response time for the device."""
+
+    _attr_name = "API Latency p50"
+    _attr_icon = "mdi:timer-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _metric = "latency_p50"
+    _field = "p50"
+    _scale = 1000
+
+
+class KohlerApiLatencyP95Sensor(KohlerApiMetricSensor):
+    """95th-percentile API response time for the device."""
+
+    _attr_name = "API Latency p95"
+    _attr_icon = "mdi:timer-alert-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _metric = "latency_p95"
+    _field = "p95"
+    _scale = 1000
+
+
+class KohlerApiErrorRateSensor(KohlerApiMetricSensor):
+    """Share of the device's API calls that failed (offline not counted)."""
+
+    _attr_name = "API Error Rate"
+    _attr_icon = "mdi:alert-circle-outline"
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _metric = "error_rate"
+    _field = "error_rate"
+    _scale = 100
+    _digits = 1
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        stats = self.hub.metrics.device_stats(self._device_id)
+        return {
+            "offline_rate": (
+                None
+                if stats.offline_rate is None
+                else round(stats.offline_rate * 100, 1)
+            )
+        }
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        return (*super()._fingerprint(), self.extra_state_attributes)
+
+
+class KohlerApiCallRateSensor(KohlerApiMetricSensor):
+    """How many API calls the device made, scaled to an hourly rate."""
+
+    _attr_name = "API Calls per Hour"
+    _attr_icon = "mdi:counter"
+    _attr_native_unit_of_measurement = "calls/h"
+    _metric = "calls_per_hour"
+    _field = "calls_per_hour"
+    _digits = 1
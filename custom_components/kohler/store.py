@@ -0,0 +1,138 @@
+"""On-disk cache of Kohler account data for fast startup.
+
+Every start used to wait on the customer record (device list, units) and each
+device's presets from Kohler's cloud before a single entity existed. Both
+change rarely, so the last copies are kept in an HA ``Store`` (one file per
+config entry). Setup builds entities from the cache straight away and
+revalidates against the cloud in the background.
+
+Each device's last-read state is kept too, so entities have (stale) values
+right after a restart instead of sitting ``unavailable`` until the cloud
+answers.
+
+The rotating B2C refresh token lives here as well. B2C hands out a new one on
+every silent refresh; writing each to the config entry rewrote
+``core.config_entries`` and woke the entry's update listener every time. The
+entry keeps only the token the last sign-in seeded, and the store tracks the
+latest token descended from that seed.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from kohler_anthem.models import Customer, DeviceState, PresetResponse
+
+from .const import DOMAIN, STORE_SAVE_DELAY
+
+STORAGE_VERSION = 1
+
+
+class KohlerStore:
+    """Cached customer record and preset catalogs for one config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+        self._data: dict[str, Any] = {}
+        self._dirty = False
+
+    async def async_load(self) -> None:
+        self._data = await self._store.async_load() or {}
+
+    @property
+    def customer(self) -> Customer | None:
+        """The cached customer record, or None if absent or unreadable."""
+        raw = self._data.get("customer")
+        if raw is None:
+            return None
+        try:
+            return Customer.model_validate(raw)
+        except ValueError:  # pydantic's ValidationError
+            return None
+
+    @property
+    def presets(self) -> dict[str, PresetResponse]:
+        """Cached preset catalogs by device id (unreadable ones skipped)."""
+        presets: dict[str, PresetResponse] = {}
+        for device_id, raw in self._data.get("presets", {}).items():
+            try:
+                presets[device_id] = PresetResponse.model_validate(raw)
+            except ValueError:  # pydantic's ValidationError
+                continue
+        return presets
+
+    @property
+    def states(self) -> dict[str, DeviceState]:
+        """Last-known device states by device id (unreadable ones skipped)."""
+        states: dict[str, DeviceState] = {}
+        for device_id, raw in self._data.get("states", {}).items():
+            try:
+                states[device_id] = DeviceState.model_validate(raw)
+            except ValueError:  # pydantic's ValidationError
+                continue
+        return states
+
+    def refresh_token(self, seed: str) -> str:
+        """The newest rotated token descended from ``seed``, else ``seed``.
+
+        A stored token descended from a different seed is stale: the user
+        signed in again (reauth) since it was saved, and that sign-in wins.
+        """
+        token = self._data.get("token", {})
+        if token.get("seed") == seed and token.get("current"):
+            return token["current"]
+        return seed
+
+    @callback
+    def set_refresh_token(self, seed: str, current: str) -> None:
+        self._data["token"] = {"seed": seed, "current": current}
+        self._async_schedule_save()
+
+    @callback
+    def set_customer(self, customer: Customer) -> None:
+        self._data["customer"] = customer.model_dump(mode="json", by_alias=True)
+        self._async_schedule_save()
+
+    @callback
+    def set_presets(self, device_id: str, presets: PresetResponse) -> None:
+        self._data.setdefault("presets", {})[device_id] = presets.model_dump(
+            mode="json", by_alias=True
+        )
+        self._async_schedule_save()
+
+    @callback
+    def set_state(self, device_id: str, state: DeviceState) -> None:
+        # Fields still at their defaults are dropped; they parse back to the
+        # same values, and it keeps the snapshot small.
+        self._data.setdefault("states", {})[device_id] = state.model_dump(
+            mode="json", by_alias=True, exclude_defaults=True
+        )
+        self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        # Coalesce bursts (every device's presets changing at once, a running
+        # shower's state changing on each poll) into one write; HA also
+        # flushes pending delayed saves at shutdown.
+        self._dirty = True
+        self._store.async_delay_save(self._data_to_save, STORE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        self._dirty = False
+        return self._data
+
+    async def async_flush(self) -> None:
+        """Write any pending changes now (used on unload)."""
+        if self._dirty:
+            self._dirty = False
+            await self._store.async_save(self._data)
+
+    async def async_remove(self) -> None:
+        """Delete the cache file (the config entry was removed)."""
+        await self._store.async_remove()
@@ -10,7 +10,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from . import KohlerKonnectCoordinator, run_device_command
+from . import KohlerKonnectCoordinator
 from .const import DOMAIN, WARMUP_DISABLED_MESSAGE
 from .entity import KohlerEntity
 
@@ -39,29 +39,38 @@ class KohlerWarmupSwitch(KohlerEntity, SwitchEntity):
 
     @property
     def is_on(self) -> bool:
-        state = self._state
-        return bool(state and state.is_warming_up)
+        view = self._view
+        return bool(view and view.warming_up)
+
+    def _fingerprint(self) -> tuple[Any, ...]:
+        return (self.available, self.is_on)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         # Warmup disabled on the fixture: the cloud accepts the command (200)
         # but the device ignores it, so block it with a clear message rather
         # than let it silently no-op. Unknown state (None) falls through and
         # lets the command run.
-        if self.coordinator.is_warmup_enabled(self._device_id) is False:
+        if self.hub.is_warmup_enabled(self._device_id) is False:
             raise HomeAssistantError(WARMUP_DISABLED_MESSAGE)
-        await run_device_command(
-            self.coordinator.client.start_warmup(
-                self.coordinator.tenant_id, self._device_id
-            ),
+        view = self._view
+        if view is not None and view.warming_up and not self.coordinator.stale:
+            # Already warming up; re-sending would only restart nothing.
+            return
+        await self.hub.async_send(
+            self._device_id,
             "start warmup",
+            lambda: self.hub.client.start_warmup(self.hub.tenant_id, self._device_id),
         )
-        await self.coordinator.async_request_refresh()
+        await self.hub.async_refresh_device(self._device_id)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
-        await run_device_command(
-            self.coordinator.client.stop_warmup(
-                self.coordinator.tenant_id, self._device_id
-            ),
+        view = self._view
+        if view is not None and not view.warming_up and not self.coordinator.stale:
+            # Already idle (as last read, not as restored from disk).
+            return
+        await self.hub.async_send(
+            self._device_id,
             "stop warmup",
+            lambda: self.hub.client.stop_warmup(self.hub.tenant_id, self._device_id),
         )
-        await self.coordinator.async_request_refresh()
+        await self.hub.async_refresh_device(self._device_id)
@@ -0,0 +1,170 @@
+"""Proactive renewal of the Kohler access tokens.
+
+The library refreshes its two access tokens lazily: the ROPC token (reads)
+and the B2C_1A_signin token (``/commands/*`` writes) are only renewed by the
+request that finds them within five minutes of expiry. A command sent just
+then pays for a token round trip first, and the B2C token isn't fetched at
+all until the first command. This renews each token ``TOKEN_REFRESH_MARGIN``
+seconds before its JWT ``exp``, so requests always find a valid token, and
+turns a rejected refresh into reauth before anyone needs the shower.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import logging
+import time
+from collections.abc import Callable
+from enum import StrEnum
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from kohler_anthem import KohlerAnthemClient
+from kohler_anthem.exceptions import AuthenticationError, KohlerAnthemError
+
+from .const import TOKEN_REFRESH_MARGIN, TOKEN_RETRY_DELAY
+from .metrics import ApiMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def decode_token_claims(access_token: str | None) -> dict[str, Any] | None:
+    """Decode a JWT's claims without verifying it; ``None`` if unreadable."""
+    if not access_token:
+        return None
+    try:
+        payload = access_token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload))
+    except (IndexError, ValueError, binascii.Error, json.JSONDecodeError) as err:
+        _LOGGER.warning("Could not decode access token: %s", err)
+        return None
+
+
+def token_expiry(access_token: str | None) -> float | None:
+    """The token's ``exp`` claim as a Unix timestamp, if it has one."""
+    claims = decode_token_claims(access_token)
+    if not claims or not isinstance(claims.get("exp"), int | float):
+        return None
+    return float(claims["exp"])
+
+
+class TokenKind(StrEnum):
+    """The library's two access tokens."""
+
+    READ = "read"  # ROPC policy
+    WRITE = "write"  # B2C_1A_signin policy
+
+
+class TokenRefresher:
+    """Renews both access tokens ahead of expiry on HA's event loop."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        client: KohlerAnthemClient,
+        metrics: ApiMetrics,
+        on_refreshed: Callable[[], None],
+    ) -> None:
+        self._hass = hass
+        self._entry = entry
+        self._client = client
+        self._metrics = metrics
+        # Called after each successful renewal (a B2C renewal rotates the
+        # refresh token, which must be persisted).
+        self._on_refreshed = on_refreshed
+        self._timers: dict[TokenKind, CALLBACK_TYPE] = {}
+
+    @callback
+    def async_start(self) -> None:
+        """Schedule the read token's renewal and fetch the write token now."""
+        self._async_schedule(TokenKind.READ)
+        self._async_schedule_in(TokenKind.WRITE, 0)
+
+    @callback
+    def async_stop(self) -> None:
+        for cancel in self._timers.values():
+            cancel()
+        self._timers.clear()
+
+    def _auth(self, kind: TokenKind) -> Any:
+        return self._client._auth if kind is TokenKind.READ else self._client._b2c_auth
+
+    @callback
+    def _async_schedule(self, kind: TokenKind, floor: float = 0) -> None:
+        """Schedule ``kind``'s next renewal from its current token's expiry.
+
+        ``floor`` keeps a token that lives shorter than the margin from being
+        renewed in a tight loop.
+        """
+        token = self._auth(kind)._token
+        if token is None:
+            self._async_schedule_in(kind, 0)
+            return
+        # Prefer the JWT's own exp; the library's expires_at is computed from
+        # expires_in on receipt and lags it by the response time.
+        expires_at = token_expiry(token.access_token) or token.expires_at
+        self._async_schedule_in(
+            kind, max(expires_at - TOKEN_REFRESH_MARGIN - time.time(), floor)
+        )
+
+    @callback
+    def _async_schedule_in(self, kind: TokenKind, delay: float) -> None:
+        if (cancel := self._timers.pop(kind, None)) is not None:
+            cancel()
+
+        @callback
+        def _fire(_now: object) -> None:
+            self._timers.pop(kind, None)
+            self._entry.async_create_background_task(
+                self._hass, self._async_refresh(kind), f"kohler {kind} token refresh"
+            )
+
+        self._timers[kind] = async_call_later(self._hass, delay, _fire)
+
+    async def _async_refresh(self, kind: TokenKind) -> None:
+        session = self._client._session
+        if session is None:
+            # The client was closed (entry unloading).
+            return
+        auth = self._auth(kind)
+        try:
+            if kind is TokenKind.READ and not (
+                auth.token is not None and auth.token.refresh_token
+            ):
+                # ROPC responses may omit a refresh token; sign in again.
+                renewal = auth.authenticate(session)
+            else:
+                renewal = auth.refresh(session)
+            await self._metrics.track(f"token_refresh_{kind}", None, renewal)
+        except AuthenticationError as err:
+            if err.status_code is None:
+                # Network trouble, not a rejected credential: try again soon.
+                _LOGGER.debug("Could not renew the Kohler %s token: %s", kind, err)
+                self._async_schedule_in(kind, TOKEN_RETRY_DELAY)
+                return
+            _LOGGER.warning("Kohler rejected the %s token renewal: %s", kind, err)
+            self._entry.async_start_reauth(self._hass)
+            return
+        except KohlerAnthemError as err:
+            _LOGGER.debug("Could not renew the Kohler %s token: %s", kind, err)
+            self._async_schedule_in(kind, TOKEN_RETRY_DELAY)
+            return
+        except TimeoutError:
+            # The session's total timeout; the library doesn't wrap it.
+            _LOGGER.debug("Timed out renewing the Kohler %s token", kind)
+            self._async_schedule_in(kind, TOKEN_RETRY_DELAY)
+            return
+        except Exception:
+            # Anything else must not end the renewal cycle for this token.
+            _LOGGER.exception("Unexpected error renewing the Kohler %s token", kind)
+            self._async_schedule_in(kind, TOKEN_RETRY_DELAY)
+            return
+        self._on_refreshed()
+        self._async_schedule(kind, floor=TOKEN_RETRY_DELAY)
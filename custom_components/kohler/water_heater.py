@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from functools import partial
 from typing import Any
 
 import voluptuous as vol
@@ -13,15 +16,17 @@ from homeassistant.components.water_heater import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from kohler_anthem.models import Device
 
-from . import KohlerKonnectCoordinator, run_device_command
+from . import KohlerKonnectCoordinator
+from .commands import CommandOutcome
 from .const import (
+    ATTR_FORCE,
     DOMAIN,
     SERVICE_PAUSE_SHOWER,
     SERVICE_START_PRESET,
@@ -29,8 +34,11 @@ from .const import (
     SERVICE_STOP_SHOWER,
     WARMUP_DISABLED_MESSAGE,
 )
+from .derived import DeviceView
 from .entity import KohlerEntity
-from .helpers import build_off_control, clamp_encode_temp, from_celsius, to_celsius
+from .helpers import build_pause_control, to_celsius
+
+_LOGGER = logging.getLogger(__name__)
 
 OPERATION_OFF = "off"
 OPERATION_WARMUP = "warmup"
@@ -49,6 +57,17 @@ SUPPORT_FLAGS = (
 )
 
 
+def operation_from_view(view: DeviceView | None) -> str:
+    """The operation mode a device's state reports."""
+    if view is None:
+        return OPERATION_OFF
+    if view.warming_up:
+        return OPERATION_WARMUP
+    if view.running:
+        return OPERATION_RUNNING
+    return OPERATION_PAUSE if view.paused else OPERATION_OFF
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -68,14 +87,17 @@ async def async_setup_entry(
         {vol.Required("preset_id"): cv.positive_int},
         "async_start_preset",
     )
+    # ``force`` sends the command even when the shower already reports the
+    # state it would set.
+    force_schema = {vol.Optional(ATTR_FORCE, default=False): cv.boolean}
     platform.async_register_entity_service(
-        SERVICE_START_WARMUP, None, "async_start_warmup"
+        SERVICE_START_WARMUP, force_schema, "async_start_warmup"
     )
     platform.async_register_entity_service(
-        SERVICE_STOP_SHOWER, None, "async_stop_shower"
+        SERVICE_STOP_SHOWER, force_schema, "async_stop_shower"
     )
     platform.async_register_entity_service(
-        SERVICE_PAUSE_SHOWER, None, "async_pause_shower"
+        SERVICE_PAUSE_SHOWER, force_schema, "async_pause_shower"
     )
 
 
@@ -98,10 +120,7 @@ class KohlerAnthemShower(KohlerEntity, WaterHeaterEntity):
     ) -> None:
         super().__init__(coordinator, device)
         self._optimistic_operation: str | None = None
-        # Local target-temperature setpoint (in the account's unit). The Kohler
-        # API has no "set temperature without running water" command, so we hold
-        # the desired temperature locally and apply it on start / while running.
-        self._target_temperature: float | None = None
+        self._confirm_task: asyncio.Task[None] | None = None
 
         # Present temperatures in the account's unit so values round-trip with
         # what the API returns (it does not convert).
@@ -121,26 +140,45 @@ class KohlerAnthemShower(KohlerEntity, WaterHeaterEntity):
 
     @property
     def _runtime(self):
-        return self.coordinator.runtime[self._device_id]
+        return self.hub.runtime[self._device_id]
 
+    @callback
     def _handle_coordinator_update(self) -> None:
-        """Clear optimistic operation when fresh data arrives."""
-        self._optimistic_operation = None
+        """Clear the optimistic operation once the device reports it.
+
+        A read from before the command took effect must not flip the UI back;
+        if the device never gets there, the confirmation clears it instead.
+        """
+        if self._optimistic_operation == self._real_operation():
+            self._optimistic_operation = None
         super()._handle_coordinator_update()
 
+    async def async_will_remove_from_hass(self) -> None:
+        if self._confirm_task is not None:
+            self._confirm_task.cancel()
+        await super().async_will_remove_from_hass()
+
     def _real_operation(self) -> str:
-        state = self._state
-        if state is None:
-            return OPERATION_OFF
-        if state.is_warming_up:
-            return OPERATION_WARMUP
-        paused = False
-        for valve in state.state.valve_state:
-            if valve.is_active or valve.at_flow:
-                return OPERATION_RUNNING
-            if valve.pause_flag:
-                paused = True
-        return OPERATION_PAUSE if paused else OPERATION_OFF
+        return operation_from_view(self._view)
+
+    @callback
+    def _async_confirm_in_background(self, operation: str) -> None:
+        """Confirm ``operation`` without holding up the service call."""
+        if self._confirm_task is not None:
+            self._confirm_task.cancel()
+        self._confirm_task = self.hass.async_create_background_task(
+            self._async_confirm(operation), f"kohler confirm {self._device_id}"
+        )
+
+    async def _async_confirm(self, operation: str) -> None:
+        await self.hub.async_confirm(
+            self._device_id, lambda view: operation_from_view(view) == operation
+        )
+        # Confirmed or timed out, show what the device itself reports now,
+        # unless a newer command has set its own (awaiting its confirmation).
+        if self._optimistic_operation == operation:
+            self._optimistic_operation = None
+            self.async_write_ha_state()
 
     @property
     def current_operation(self) -> str:
@@ -151,41 +189,31 @@ class KohlerAnthemShower(KohlerEntity, WaterHeaterEntity):
     @property
     def current_temperature(self) -> float | None:
         """Measured outlet temperature (Valve1 / outlet2), in the account unit."""
-        state = self._state
-        if state is None:
+        view = self._view
+        if view is None:
             return None
-        for valve in state.state.valve_state:
-            if valve.valve_index == "Valve1":
-                for outlet in valve.outlets:
-                    if outlet.outlet_index == "outlet2":
-                        temp_c = outlet.outlet_temp
-                        if not temp_c:
-                            return None
-                        # The API reports temperatures in Celsius; present in
-                        # the account's unit to match _attr_temperature_unit.
-                        return round(
-                            from_celsius(temp_c, self.coordinator.temperature_unit), 1
-                        )
-        return None
+        return view.outlet_temperature
 
     @property
     def target_temperature(self) -> float | None:
-        if self._target_temperature is not None:
-            return self._target_temperature
-        state = self._state
-        if state is not None:
-            for valve in state.state.valve_state:
-                if valve.valve_index == "Valve1" and valve.temperature_setpoint:
-                    # API setpoint is Celsius; present in the account's unit.
-                    return round(
-                        from_celsius(
-                            valve.temperature_setpoint,
-                            self.coordinator.temperature_unit,
-                        ),
-                        1,
-                    )
+        # The Kohler API has no "set temperature without running water"
+        # command, so the desired setpoint is held in the runtime settings and
+        # applied on start / while running.
+        if self._runtime.target_temperature is not None:
+            return self._runtime.target_temperature
+        view = self._view
+        if view is not None and view.target_temperature is not None:
+            return view.target_temperature
         return self._default_target
 
+    def _fingerprint(self) -> tuple[Any, ...]:
+        return (
+            self.available,
+            self.current_operation,
+            self.current_temperature,
+            self.target_temperature,
+        )
+
     # -- commands ---------------------------------------------------------- #
 
     def _guard_warmup_enabled(self) -> None:
@@ -196,34 +224,41 @@ class KohlerAnthemShower(KohlerEntity, WaterHeaterEntity):
         the warmup control silently does nothing. Raise a clear error instead.
         Unknown state (no data read yet) is allowed through.
         """
-        if self.coordinator.is_warmup_enabled(self._device_id) is False:
+        if self.hub.is_warmup_enabled(self._device_id) is False:
             raise HomeAssistantError(WARMUP_DISABLED_MESSAGE)
 
     def _target_celsius(self) -> float:
         """Current target as Celsius for the library write API."""
         target = self.target_temperature or self._default_target
-        return to_celsius(target, self.coordinator.temperature_unit)
+        return to_celsius(target, self.hub.temperature_unit)
 
-    def _turn_on_coro(self, temperature_celsius: float | None = None) -> Any:
+    def _turn_on_coro(self) -> Any:
         """Coroutine that starts water on the selected outlet at the desired
-        flow (both held by the coordinator's per-device runtime settings)."""
-        runtime = self._runtime
-        return self.coordinator.client.turn_on_outlet(
-            self.coordinator.tenant_id,
-            self._device_id,
-            runtime.outlet,
-            temperature_celsius=(
-                temperature_celsius
-                if temperature_celsius is not None
-                else self._target_celsius()
-            ),
-            flow_percent=runtime.flow_percent,
-        )
+        flow and temperature (held by the coordinator's per-device runtime
+        settings)."""
+        return self.hub.async_turn_on_outlet(self._device_id, self._target_celsius())
+
+    def _is_noop(self, operation: str) -> bool:
+        """True if the shower already reports what ``operation`` would set."""
+        view = self._view
+        if view is None or self.coordinator.stale:
+            # Nothing read yet, or only the state restored from disk: don't
+            # guess, send it.
+            return False
+        if operation == OPERATION_RUNNING:
+            return self.hub.turn_on_is_applied(self._device_id, self._target_celsius())
+        if operation == OPERATION_OFF:
+            # _async_turn_off also clears a selected preset.
+            return (
+                self._real_operation() == OPERATION_OFF
+                and view.active_preset_id is None
+            )
+        return self._real_operation() == operation
 
     async def _async_turn_off(self) -> None:
         """Stop any session-level activity, then close the valves."""
-        client = self.coordinator.client
-        tenant_id = self.coordinator.tenant_id
+        client = self.hub.client
+        tenant_id = self.hub.tenant_id
         state = self._state
 
         # Warmup and presets are session-level state on the controller;
@@ -237,73 +272,88 @@ class KohlerAnthemShower(KohlerEntity, WaterHeaterEntity):
         await client.control_valve(
             tenant_id,
             self._device_id,
-            build_off_control(state, self._target_celsius()),
+            self.hub.off_control(self._device_id, self._target_celsius()),
         )
 
-    async def _run_command_and_refresh(self, operation: str, coro: Any) -> None:
-        """Send a command, optimistically update, then re-poll twice.
-
-        On failure (including device-offline), clear the optimistic state and
-        let run_device_command raise a clean HomeAssistantError for the UI.
+    async def _run_command_and_refresh(
+        self,
+        operation: str,
+        factory: Callable[[], Awaitable[Any]],
+        key: str | None = None,
+        force: bool = False,
+    ) -> None:
+        """Send a command, optimistically update, then confirm in the background.
+
+        The command goes through the device's command queue and this returns
+        as soon as the cloud accepts it. On failure (including device-offline),
+        clear the optimistic state and let the queue's clean HomeAssistantError
+        reach the UI. A command superseded by a later one leaves the
+        confirmation to that one. Unless ``force``, a command the shower's
+        last-known state says would change nothing is skipped.
         """
+        if not force and self._is_noop(operation):
+            _LOGGER.debug(
+                "Skipping %s on %s: the shower already reports it",
+                operation,
+                self._device_id,
+            )
+            return
         self._optimistic_operation = operation
         self.async_write_ha_state()
 
         try:
-            await run_device_command(coro, operation)
+            outcome = await self.hub.async_send(
+                self._device_id, operation, factory, key
+            )
         except Exception:
             # Revert optimistic state so the UI reflects reality, then re-raise
             # so HA surfaces the (already user-friendly) message.
-            self._optimistic_operation = None
-            self.async_write_ha_state()
+            if self._optimistic_operation == operation:
+                self._optimistic_operation = None
+                self.async_write_ha_state()
             raise
-
-        await self.coordinator.async_request_refresh()
-        await asyncio.sleep(5)
-        await self.coordinator.async_request_refresh()
+        if outcome is CommandOutcome.SENT:
+            self._async_confirm_in_background(operation)
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
         temp = kwargs.get(ATTR_TEMPERATURE)
         if temp is None:
             return
-        self._target_temperature = float(temp)
+        self._runtime.target_temperature = float(temp)
         self.async_write_ha_state()
 
-        # If the shower is actively running, apply the new temperature live.
+        # If the shower is actively running, apply the new temperature live
+        # (once a burst of changes settles).
         if self._real_operation() == OPERATION_RUNNING:
-            await self._run_command_and_refresh(
-                OPERATION_RUNNING,
-                self._turn_on_coro(
-                    to_celsius(float(temp), self.coordinator.temperature_unit)
-                ),
+            await self.hub.async_apply_runtime(
+                self._device_id, f"set temperature to {temp}"
             )
 
     async def async_set_operation_mode(self, operation_mode: str) -> None:
-        client = self.coordinator.client
-        tenant_id = self.coordinator.tenant_id
+        client = self.hub.client
+        tenant_id = self.hub.tenant_id
 
+        factory: Callable[[], Awaitable[Any]]
         if operation_mode == OPERATION_WARMUP:
             self._guard_warmup_enabled()
-            coro = client.start_warmup(tenant_id, self._device_id)
+            factory = partial(client.start_warmup, tenant_id, self._device_id)
         elif operation_mode == OPERATION_OFF:
-            coro = self._async_turn_off()
+            factory = self._async_turn_off
         elif operation_mode == OPERATION_RUNNING:
-            coro = self._turn_on_coro()
+            factory = self._turn_on_coro
         elif operation_mode == OPERATION_PAUSE:
-            coro = self._pause_coro()
+            factory = self._pause_coro
         else:
             return
 
-        await self._run_command_and_refresh(operation_mode, coro)
+        await self._run_command_and_refresh(operation_mode, factory)
 
     def _pause_coro(self) -> Any:
         """Coroutine that pauses water flow but keeps the session active."""
-        runtime = self._runtime
-        return self.coordinator.client.pause(
-            self.coordinator.tenant_id,
+        return self.hub.client.control_valve(
+            self.hub.tenant_id,
             self._device_id,
-            temperature_celsius=clamp_encode_temp(self._target_celsius()),
-            flow_percent=runtime.flow_percent,
+            build_pause_control(self._target_celsius(), self._runtime.flow_percent),
         )
 
     # -- entity services ---------------------------------------------------- #
@@ -315,40 +365,46 @@ class KohlerAnthemShower(KohlerEntity, WaterHeaterEntity):
         corrected two-step (select + mode-0x01 valve write) and raises a clear
         error for experiences, which can't be started from HA.
         """
-        presets = self.coordinator.presets.get(self._device_id)
-        preset = presets.get_preset(preset_id) if presets else None
+        index = self.hub.preset_index(self._device_id)
+        preset = index.by_id.get(preset_id)
         if preset is None:
-            known = (
-                ", ".join(p.preset_id for p in presets.presets)
-                if presets and presets.presets
-                else "none"
-            )
+            known = ", ".join(str(known_id) for known_id in index.by_id) or "none"
             raise HomeAssistantError(
                 f"Unknown Kohler preset id {preset_id} (known ids: {known})"
             )
         self._optimistic_operation = OPERATION_RUNNING
         self.async_write_ha_state()
         try:
-            await self.coordinator.async_start_preset(self._device_id, preset)
+            outcome = await self.hub.async_start_preset(self._device_id, preset)
         except Exception:
-            self._optimistic_operation = None
-            self.async_write_ha_state()
+            if self._optimistic_operation == OPERATION_RUNNING:
+                self._optimistic_operation = None
+                self.async_write_ha_state()
             raise
+        # Returns once the command is accepted; the confirmation does the
+        # reading.
+        if outcome is CommandOutcome.SENT:
+            self._async_confirm_in_background(OPERATION_RUNNING)
 
-    async def async_start_warmup(self) -> None:
+    async def async_start_warmup(self, force: bool = False) -> None:
         """Start warmup (kohler.start_warmup service)."""
         self._guard_warmup_enabled()
         await self._run_command_and_refresh(
             OPERATION_WARMUP,
-            self.coordinator.client.start_warmup(
-                self.coordinator.tenant_id, self._device_id
+            partial(
+                self.hub.client.start_warmup, self.hub.tenant_id, self._device_id
             ),
+            force=force,
         )
 
-    async def async_stop_shower(self) -> None:
+    async def async_stop_shower(self, force: bool = False) -> None:
         """Stop all water flow (kohler.stop_shower service)."""
-        await self._run_command_and_refresh(OPERATION_OFF, self._async_turn_off())
+        await self._run_command_and_refresh(
+            OPERATION_OFF, self._async_turn_off, force=force
+        )
 
-    async def async_pause_shower(self) -> None:
+    async def async_pause_shower(self, force: bool = False) -> None:
         """Pause water flow, keeping the session active (kohler.pause_shower)."""
-        await self._run_command_and_refresh(OPERATION_PAUSE, self._pause_coro())
+        await self._run_command_and_refresh(
+            OPERATION_PAUSE, self._pause_coro, force=force
+        )
@@ -0,0 +1,106 @@
+"""Micro-benchmark: table-driven valve codec vs. the library's encoder.
+
+Run from the repository root with ``kohler-anthem`` installed:
+
+    python scripts/bench_valve_codec.py
+
+Home Assistant isn't needed: ``helpers.py`` is loaded straight from its file,
+bypassing the integration package's ``__init__``.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import random
+import sys
+import timeit
+from pathlib import Path
+
+from kohler_anthem import encode_valve_command
+from kohler_anthem.models import Outlet, ValveMode, ValvePrefix
+from kohler_anthem.valve import create_outlet_command
+
+HELPERS = Path(__file__).resolve().parent.parent / "custom_components/kohler/helpers.py"
+spec = importlib.util.spec_from_file_location("kohler_helpers", HELPERS)
+helpers = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = helpers
+spec.loader.exec_module(helpers)
+
+N = 200_000
+random.seed(0)
+CASES = [
+    (
+        random.uniform(15.0, 49.0),
+        random.randrange(0, 101, 5),
+        random.choice(list(ValveMode)),
+        random.choice(list(ValvePrefix)),
+    )
+    for _ in range(1000)
+]
+# Every x.x5 °C setpoint sits on a rounding tie, where table and library
+# arithmetic could disagree; they're checked but not timed.
+TIES = [
+    (tenths / 10 + 0.05, flow, ValveMode.SHOWER, ValvePrefix.PRIMARY)
+    for tenths in range(140, 500)
+    for flow in (0, 50, 100)
+]
+
+
+def library_encode() -> None:
+    for temp, flow, mode, prefix in CASES:
+        encode_valve_command(
+            temperature_celsius=helpers.clamp_encode_temp(temp),
+            flow_percent=flow,
+            mode=mode,
+            prefix=prefix,
+        )
+
+
+def table_encode() -> None:
+    for temp, flow, mode, prefix in CASES:
+        helpers.encode_valve_hex(temp, flow, mode, prefix)
+
+
+def bench(label: str, func) -> float:
+    loops = N // len(CASES)
+    best = min(timeit.repeat(func, number=loops, repeat=5))
+    per_call = best / (loops * len(CASES)) * 1e9
+    print(f"{label:<16} {per_call:8.1f} ns/command")
+    return per_call
+
+
+def main() -> None:
+    # Both encoders must agree byte for byte before timing means anything.
+    for case in CASES + TIES:
+        temp, flow, mode, prefix = case
+        code = helpers.encode_valve_hex(*case)
+        expected = encode_valve_command(
+            temperature_celsius=helpers.clamp_encode_temp(temp),
+            flow_percent=flow,
+            mode=mode,
+            prefix=prefix,
+        )
+        assert code == expected, (case, code, expected)
+    # The turn-on and pause payloads match what the library's turn_on_outlet
+    # and pause would have sent.
+    for temp, flow, _mode, _prefix in CASES + TIES:
+        temp = helpers.clamp_encode_temp(temp)
+        for outlet in Outlet:
+            code = helpers.build_outlet_control(outlet, temp, flow).primary_valve1
+            expected = create_outlet_command(
+                outlet, temperature_celsius=temp, flow_percent=flow
+            )
+            assert code == expected, (outlet, temp, flow, code, expected)
+        code = helpers.build_pause_control(temp, flow).primary_valve1
+        expected = encode_valve_command(
+            temperature_celsius=temp, flow_percent=flow, mode=ValveMode.STOP
+        )
+        assert code == expected, (temp, flow, code, expected)
+
+    lib = bench("library encode", library_encode)
+    table = bench("table encode", table_encode)
+    print(f"{'':<16} {lib / table:8.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()